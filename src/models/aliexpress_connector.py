@@ -3,21 +3,33 @@ Conector específico para AliExpress Dropshipping API.
 Implementa todas as funcionalidades necessárias para integração com o AliExpress.
 """
 
-import hashlib
-import hmac
 import time
-import json
-import urllib.parse
-from typing import Dict, List, Optional, Any
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import repeat
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from src.models.connector_base import (
     BaseConnector, ConnectorConfig, Product, Order, OrderResponse, 
-    TrackingInfo, Address, OrderItem, OrderStatus
+    TrackingInfo, Address, OrderItem, OrderStatus, json_dumps, json_loads
 )
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Tabela de URL-encoding byte -> texto (equivalente a urllib.parse.quote com safe='')
+_SIGN_SAFE_BYTES = frozenset(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_.-~')
+_QUOTE_TABLE = tuple(chr(b) if b in _SIGN_SAFE_BYTES else f'%{b:02X}' for b in range(256))
+
+
+def _quote_pair(pair: str) -> str:
+    """
+    Aplica URL-encoding a um par "chave=valor" da string de assinatura.
+    A codificação percorre os bytes via tabela. Não há cache: os pares incluem
+    tokens de sessão, timestamps e dados do cliente, que não devem ficar em memória.
+    """
+    return ''.join(map(_QUOTE_TABLE.__getitem__, pair.encode('utf-8')))
+
 
 class AliExpressConnector(BaseConnector):
     """
@@ -25,10 +37,24 @@ class AliExpressConnector(BaseConnector):
     Implementa autenticação, busca de produtos, criação de pedidos e rastreamento.
     """
 
+    # Validade (em segundos) dos caches em memória
+    FEEDNAME_CACHE_TTL = 3600
+    FEEDNAME_CACHE_MAXSIZE = 256
+    TOKEN_CHECK_TTL = 60
+
+    # Limite de requisições simultâneas por operação (evita respostas 429 da API); fica bem
+    # abaixo do pool de conexões keep-alive da sessão (POOL_MAXSIZE por host, ver BaseConnector)
+    REQUEST_MAX_WORKERS = 8
+
+    # Quantidade de produtos por lote na sincronização de estoque
+    BATCH_SIZE = 50
+
     def __init__(self, config: ConnectorConfig):
         super().__init__(config)
         self.app_key = config.api_key
         self.app_secret = config.api_secret
+        self._app_secret_bytes = (self.app_secret or '').encode('utf-8')
+        self._ipad_hash, self._opad_hash = self._build_hmac_states(self._app_secret_bytes)
         self.access_token = config.additional_config.get('access_token')
         self.refresh_token = config.additional_config.get('refresh_token')
         self.token_expires_at = config.additional_config.get('token_expires_at')
@@ -42,6 +68,28 @@ class AliExpressConnector(BaseConnector):
         self.default_currency = config.additional_config.get('default_currency', 'USD')
         self.default_language = config.additional_config.get('default_language', 'en')
 
+        # Parâmetros base que não mudam entre requisições
+        self._base_params_template = {
+            'app_key': self.app_key,
+            'format': 'json',
+            'v': '2.0',
+            'sign_method': 'hmac'
+        }
+
+        # Requisições idênticas em andamento (coalescência de chamadas concorrentes)
+        self._inflight: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], Future] = {}
+        self._inflight_lock = threading.Lock()
+
+        # Cache de feednames: a lista completa vem de uma única chamada à API
+        self._feednames: Optional[List[Dict[str, Any]]] = None
+        self._feednames_fetched_at = 0.0
+        self._feedname_cache: Dict[Optional[str], Optional[str]] = {}
+
+        # Última autenticação bem-sucedida (time.monotonic) e trava da renovação do token.
+        # Começa em -inf: time.monotonic() pode ser menor que TOKEN_CHECK_TTL logo após o boot
+        self._last_auth_ok_at = float('-inf')
+        self._refresh_lock = threading.Lock()
+
     def _generate_signature(self, method: str, params: Dict[str, Any]) -> str:
         """
         Gera a assinatura necessária para autenticar requisições na API do AliExpress.
@@ -56,20 +104,20 @@ class AliExpressConnector(BaseConnector):
         # Ordena os parâmetros alfabeticamente
         sorted_params = sorted(params.items())
         
-        # Constrói a string de consulta
-        query_string = '&'.join([f"{k}={v}" for k, v in sorted_params])
+        # Constrói a string de consulta já com URL-encoding. Codificar cada par "k=v"
+        # separadamente e unir com '%26' (o '&' codificado) produz o mesmo resultado que
+        # codificar a string inteira.
+        quoted_query = '%26'.join([_quote_pair(f"{k}={v}") for k, v in sorted_params])
         
         # Constrói a string para assinar
-        string_to_sign = f"{method}&{urllib.parse.quote(query_string, safe='')}"
+        string_to_sign = f"{method}&{quoted_query}".encode('utf-8')
         
-        # Gera a assinatura HMAC-SHA256
-        signature = hmac.new(
-            self.app_secret.encode('utf-8'),
-            string_to_sign.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest().upper()
-        
-        return signature
+        # Gera a assinatura HMAC-SHA256 a partir dos estados pré-calculados da chave
+        inner = self._ipad_hash.copy()
+        inner.update(string_to_sign)
+        outer = self._opad_hash.copy()
+        outer.update(inner.digest())
+        return outer.hexdigest().upper()
 
     def _build_request_params(self, method: str, api_params: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -86,14 +134,9 @@ class AliExpressConnector(BaseConnector):
             api_params = {}
 
         # Parâmetros base obrigatórios
-        params = {
-            'method': method,
-            'app_key': self.app_key,
-            'timestamp': str(int(time.time() * 1000)),
-            'format': 'json',
-            'v': '2.0',
-            'sign_method': 'hmac'
-        }
+        params = self._base_params_template.copy()
+        params['method'] = method
+        params['timestamp'] = str(time.time_ns() // 1_000_000)
 
         # Adiciona access_token se disponível
         if self.access_token:
@@ -102,7 +145,7 @@ class AliExpressConnector(BaseConnector):
         # Adiciona parâmetros específicos da API
         for key, value in api_params.items():
             if isinstance(value, (dict, list)):
-                params[key] = json.dumps(value)
+                params[key] = json_dumps(value)
             else:
                 params[key] = str(value)
 
@@ -111,6 +154,61 @@ class AliExpressConnector(BaseConnector):
         
         return params
 
+    def _coalesce(self, key: Tuple[str, Tuple[Tuple[str, Any], ...]], fetch: Callable[[], Any]) -> Any:
+        """
+        Executa `fetch` uma única vez para chamadas concorrentes com a mesma chave.
+        As demais chamadas aguardam e compartilham o resultado da requisição em andamento.
+        
+        Args:
+            key: Chave da requisição (método, parâmetros ordenados)
+            fetch: Função que executa a requisição
+            
+        Returns:
+            Any: Resultado de `fetch`
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not is_owner:
+            return future.result()
+
+        try:
+            result = fetch()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _call_api_coalesced(self, method: str, api_params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Faz uma chamada à API compartilhando a resposta entre chamadas concorrentes idênticas.
+        
+        Args:
+            method: Nome do método da API
+            api_params: Parâmetros específicos da API
+            
+        Returns:
+            Dict: Resposta da API decodificada
+        """
+        api_params = api_params or {}
+        key = (method, tuple(sorted(api_params.items())))
+
+        def fetch() -> Dict[str, Any]:
+            params = self._build_request_params(method, api_params)
+            response = self._make_request('POST', self.api_base_url, data=params)
+            return json_loads(response.content)
+
+        return self._coalesce(key, fetch)
+
     def authenticate(self) -> bool:
         """
         Autentica com a API do AliExpress.
@@ -132,11 +230,18 @@ class AliExpressConnector(BaseConnector):
                     logger.info("Token expirado, tentando renovar...")
                     return self._refresh_access_token()
 
+            # Reaproveita uma autenticação bem-sucedida recente
+            if time.monotonic() - self._last_auth_ok_at < self.TOKEN_CHECK_TTL:
+                return True
+
             # Testa o token fazendo uma chamada simples
-            return self._test_token()
+            is_valid = self._test_token()
+            if is_valid:
+                self._last_auth_ok_at = time.monotonic()
+            return is_valid
             
         except Exception as e:
-            logger.error(f"Erro na autenticação AliExpress: {e}")
+            logger.error("Erro na autenticação AliExpress: %s", e)
             return False
 
     def _test_token(self) -> bool:
@@ -150,16 +255,31 @@ class AliExpressConnector(BaseConnector):
             params = self._build_request_params('aliexpress.ds.category.get')
             response = self._make_request('POST', self.api_base_url, data=params)
             
-            result = response.json()
+            result = json_loads(response.content)
             return 'error_response' not in result
             
         except Exception as e:
-            logger.error(f"Erro ao testar token: {e}")
+            logger.error("Erro ao testar token: %s", e)
             return False
 
     def _refresh_access_token(self) -> bool:
         """
         Renova o access token usando o refresh token.
+        Chamadas concorrentes são serializadas: quem encontra o token já renovado
+        por outra thread retorna sem fazer uma nova requisição.
+        
+        Returns:
+            bool: True se renovado com sucesso
+        """
+        stale_token = self.access_token
+        with self._refresh_lock:
+            if self.access_token != stale_token:
+                return True
+            return self._request_token_refresh()
+
+    def _request_token_refresh(self) -> bool:
+        """
+        Faz a requisição de renovação do access token.
         
         Returns:
             bool: True se renovado com sucesso
@@ -175,7 +295,7 @@ class AliExpressConnector(BaseConnector):
             )
             
             response = self._make_request('POST', self.api_base_url, data=params)
-            result = response.json()
+            result = json_loads(response.content)
             
             if 'access_token' in result:
                 self.access_token = result['access_token']
@@ -185,16 +305,43 @@ class AliExpressConnector(BaseConnector):
                 expires_in = result.get('expires_in', 3600)
                 self.token_expires_at = (datetime.now() + timedelta(seconds=expires_in)).isoformat()
                 
+                self._last_auth_ok_at = time.monotonic()
                 logger.info("Token renovado com sucesso")
                 return True
             else:
-                logger.error(f"Erro ao renovar token: {result}")
+                logger.error("Erro ao renovar token: %s", result)
                 return False
                 
         except Exception as e:
-            logger.error(f"Erro ao renovar token: {e}")
+            logger.error("Erro ao renovar token: %s", e)
             return False
 
+    def _fetch_product_data(self, product_id: str, **kwargs) -> Optional[Dict[str, Any]]:
+        """
+        Obtém os dados brutos de um produto (resultado de aliexpress.ds.product.get).
+        
+        Args:
+            product_id: ID do produto no AliExpress
+            **kwargs: Parâmetros adicionais (country, currency, language)
+            
+        Returns:
+            Dict: Dados do produto ou None se não encontrado
+        """
+        api_params = {
+            'product_id': product_id,
+            'ship_to_country': kwargs.get('country', self.default_country),
+            'target_currency': kwargs.get('currency', self.default_currency),
+            'target_language': kwargs.get('language', self.default_language)
+        }
+        
+        result = self._call_api_coalesced('aliexpress.ds.product.get', api_params)
+        
+        if 'aliexpress_ds_product_get_response' in result:
+            return result['aliexpress_ds_product_get_response']['result']
+
+        logger.error("Erro ao obter produto %s: %s", product_id, result)
+        return None
+
     def get_product_details(self, product_id: str, **kwargs) -> Optional[Product]:
         """
         Obtém detalhes de um produto específico do AliExpress.
@@ -207,26 +354,13 @@ class AliExpressConnector(BaseConnector):
             Product: Objeto produto ou None se não encontrado
         """
         try:
-            api_params = {
-                'product_id': product_id,
-                'ship_to_country': kwargs.get('country', self.default_country),
-                'target_currency': kwargs.get('currency', self.default_currency),
-                'target_language': kwargs.get('language', self.default_language)
-            }
-            
-            params = self._build_request_params('aliexpress.ds.product.get', api_params)
-            response = self._make_request('POST', self.api_base_url, data=params)
-            result = response.json()
-            
-            if 'aliexpress_ds_product_get_response' in result:
-                product_data = result['aliexpress_ds_product_get_response']['result']
-                return self._parse_product_data(product_data)
-            else:
-                logger.error(f"Erro ao obter produto {product_id}: {result}")
+            product_data = self._fetch_product_data(product_id, **kwargs)
+            if product_data is None:
                 return None
+            return self._parse_product_data(product_data)
                 
         except Exception as e:
-            logger.error(f"Erro ao obter detalhes do produto {product_id}: {e}")
+            logger.error("Erro ao obter detalhes do produto %s: %s", product_id, e)
             return None
 
     def search_products(self, query: str, **kwargs) -> List[Product]:
@@ -246,25 +380,54 @@ class AliExpressConnector(BaseConnector):
             feedname = self._get_feedname_for_category(kwargs.get('category'))
             
             if not feedname:
-                logger.warning(f"Feedname não encontrado para categoria: {kwargs.get('category')}")
+                logger.warning("Feedname não encontrado para categoria: %s", kwargs.get('category'))
                 return []
 
             # Obtém IDs de produtos do feed
             product_ids = self._get_product_ids_from_feed(feedname, query, **kwargs)
             
-            # Obtém detalhes de cada produto
-            products = []
-            for product_id in product_ids[:20]:  # Limita a 20 produtos por busca
-                product = self.get_product_details(product_id, **kwargs)
-                if product:
-                    products.append(product)
+            # Obtém os dados de cada produto em paralelo e converte todos de uma vez
+            product_ids = product_ids[:20]  # Limita a 20 produtos por busca
+            if not product_ids:
+                return []
+
+            def fetch(product_id: str) -> Optional[Dict[str, Any]]:
+                try:
+                    return self._fetch_product_data(product_id, **kwargs)
+                except Exception as e:
+                    logger.error("Erro ao obter detalhes do produto %s: %s", product_id, e)
+                    return None
+
+            max_workers = min(self.REQUEST_MAX_WORKERS, len(product_ids))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = [product_data for product_data in executor.map(fetch, product_ids) if product_data is not None]
             
-            return products
+            return self._parse_product_batch(results)
             
         except Exception as e:
-            logger.error(f"Erro ao buscar produtos: {e}")
+            logger.error("Erro ao buscar produtos: %s", e)
+            return []
+
+    def _get_feednames(self) -> List[Dict[str, Any]]:
+        """
+        Obtém a lista completa de feednames, usando o cache em memória enquanto válido.
+        
+        Returns:
+            List[Dict]: Feednames disponíveis (vazia em caso de erro na API)
+        """
+        now = time.monotonic()
+        if self._feednames is not None and now - self._feednames_fetched_at < self.FEEDNAME_CACHE_TTL:
+            return self._feednames
+
+        result = self._call_api_coalesced('aliexpress.ds.feedname.get')
+        if 'aliexpress_ds_feedname_get_response' not in result:
             return []
 
+        self._feednames = result['aliexpress_ds_feedname_get_response']['result'] or []
+        self._feednames_fetched_at = now
+        self._feedname_cache.clear()
+        return self._feednames
+
     def _get_feedname_for_category(self, category: str = None) -> Optional[str]:
         """
         Obtém o feedname para uma categoria específica.
@@ -276,27 +439,34 @@ class AliExpressConnector(BaseConnector):
             str: Feedname ou None se não encontrado
         """
         try:
-            params = self._build_request_params('aliexpress.ds.feedname.get')
-            response = self._make_request('POST', self.api_base_url, data=params)
-            result = response.json()
-            
-            if 'aliexpress_ds_feedname_get_response' in result:
-                feednames = result['aliexpress_ds_feedname_get_response']['result']
-                
-                # Se categoria específica foi fornecida, procura por ela
-                if category:
-                    for feed in feednames:
-                        if category.lower() in feed.get('feed_name', '').lower():
-                            return feed.get('feed_name')
-                
-                # Retorna o primeiro feedname disponível
-                if feednames:
-                    return feednames[0].get('feed_name')
-            
-            return None
+            feednames = self._get_feednames()
+            if not feednames:
+                return None
+
+            cache_key = category.lower() if category else None
+            if cache_key in self._feedname_cache:
+                return self._feedname_cache[cache_key]
+
+            feedname = None
+
+            # Se categoria específica foi fornecida, procura por ela
+            if cache_key:
+                for feed in feednames:
+                    if cache_key in feed.get('feed_name', '').lower():
+                        feedname = feed.get('feed_name')
+                        break
+
+            # Retorna o primeiro feedname disponível
+            if feedname is None:
+                feedname = feednames[0].get('feed_name')
+
+            if len(self._feedname_cache) >= self.FEEDNAME_CACHE_MAXSIZE:
+                self._feedname_cache.clear()
+            self._feedname_cache[cache_key] = feedname
+            return feedname
             
         except Exception as e:
-            logger.error(f"Erro ao obter feedname: {e}")
+            logger.error("Erro ao obter feedname: %s", e)
             return None
 
     def _get_product_ids_from_feed(self, feedname: str, query: str, **kwargs) -> List[str]:
@@ -320,7 +490,7 @@ class AliExpressConnector(BaseConnector):
             
             params = self._build_request_params('aliexpress.ds.feed.itemids.get', api_params)
             response = self._make_request('POST', self.api_base_url, data=params)
-            result = response.json()
+            result = json_loads(response.content)
             
             if 'aliexpress_ds_feed_itemids_get_response' in result:
                 items = result['aliexpress_ds_feed_itemids_get_response']['result']
@@ -329,7 +499,7 @@ class AliExpressConnector(BaseConnector):
             return []
             
         except Exception as e:
-            logger.error(f"Erro ao obter IDs de produtos do feed: {e}")
+            logger.error("Erro ao obter IDs de produtos do feed: %s", e)
             return []
 
     def create_order(self, order: Order) -> OrderResponse:
@@ -377,7 +547,7 @@ class AliExpressConnector(BaseConnector):
             
             params = self._build_request_params('aliexpress.ds.order.create', api_params)
             response = self._make_request('POST', self.api_base_url, data=params)
-            result = response.json()
+            result = json_loads(response.content)
             
             if 'aliexpress_ds_order_create_response' in result:
                 order_result = result['aliexpress_ds_order_create_response']['result']
@@ -415,7 +585,7 @@ class AliExpressConnector(BaseConnector):
                 )
                 
         except Exception as e:
-            logger.error(f"Erro ao criar pedido: {e}")
+            logger.error("Erro ao criar pedido: %s", e)
             return OrderResponse(
                 success=False,
                 order_id=None,
@@ -443,7 +613,7 @@ class AliExpressConnector(BaseConnector):
             return None
             
         except Exception as e:
-            logger.error(f"Erro ao obter status do pedido {order_id}: {e}")
+            logger.error("Erro ao obter status do pedido %s: %s", order_id, e)
             return None
 
     def get_tracking_info(self, tracking_number: str) -> Optional[TrackingInfo]:
@@ -463,7 +633,7 @@ class AliExpressConnector(BaseConnector):
             
             params = self._build_request_params('aliexpress.ds.order.tracking.get', api_params)
             response = self._make_request('POST', self.api_base_url, data=params)
-            result = response.json()
+            result = json_loads(response.content)
             
             if 'aliexpress_ds_order_tracking_get_response' in result:
                 tracking_data = result['aliexpress_ds_order_tracking_get_response']['result']
@@ -501,12 +671,53 @@ class AliExpressConnector(BaseConnector):
             return None
             
         except Exception as e:
-            logger.error(f"Erro ao obter rastreamento {tracking_number}: {e}")
+            logger.error("Erro ao obter rastreamento %s: %s", tracking_number, e)
             return None
 
+    def _freight_for_item(self, item: OrderItem, address: Address) -> List[Dict[str, Any]]:
+        """
+        Consulta as opções de frete de um único item.
+        
+        Args:
+            item: Item do pedido
+            address: Endereço de entrega
+            
+        Returns:
+            List[Dict]: Opções de envio do item
+        """
+        api_params = {
+            'country_code': address.country,
+            'product_id': item.supplier_product_id,
+            'product_num': item.quantity,
+            'province_code': address.state,
+            'city_code': address.city,
+            'send_goods_country_code': 'CN',  # Assumindo origem China
+            'price': str(item.price)
+        }
+        
+        params = self._build_request_params('aliexpress.ds.freight.query', api_params)
+        response = self._make_request('POST', self.api_base_url, data=params)
+        result = json_loads(response.content)
+        
+        options = []
+        if 'aliexpress_ds_freight_query_response' in result:
+            freight_data = result['aliexpress_ds_freight_query_response']['result']
+            
+            for freight in freight_data.get('freight_list', []):
+                options.append({
+                    'service_name': freight.get('service_name'),
+                    'cost': freight.get('freight_amount'),
+                    'currency': freight.get('currency'),
+                    'delivery_time': freight.get('delivery_time'),
+                    'product_id': item.supplier_product_id
+                })
+        
+        return options
+
     def calculate_shipping(self, items: List[OrderItem], address: Address) -> Dict[str, Any]:
         """
         Calcula opções e custos de envio.
+        As consultas de frete de cada item são feitas em paralelo, com concorrência limitada.
         
         Args:
             items: Lista de itens do pedido
@@ -518,32 +729,11 @@ class AliExpressConnector(BaseConnector):
         try:
             shipping_options = []
             
-            for item in items:
-                api_params = {
-                    'country_code': address.country,
-                    'product_id': item.supplier_product_id,
-                    'product_num': item.quantity,
-                    'province_code': address.state,
-                    'city_code': address.city,
-                    'send_goods_country_code': 'CN',  # Assumindo origem China
-                    'price': str(item.price)
-                }
-                
-                params = self._build_request_params('aliexpress.ds.freight.query', api_params)
-                response = self._make_request('POST', self.api_base_url, data=params)
-                result = response.json()
-                
-                if 'aliexpress_ds_freight_query_response' in result:
-                    freight_data = result['aliexpress_ds_freight_query_response']['result']
-                    
-                    for freight in freight_data.get('freight_list', []):
-                        shipping_options.append({
-                            'service_name': freight.get('service_name'),
-                            'cost': freight.get('freight_amount'),
-                            'currency': freight.get('currency'),
-                            'delivery_time': freight.get('delivery_time'),
-                            'product_id': item.supplier_product_id
-                        })
+            if items:
+                max_workers = min(self.REQUEST_MAX_WORKERS, len(items))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    for item_options in executor.map(self._freight_for_item, items, repeat(address)):
+                        shipping_options.extend(item_options)
             
             return {
                 'options': shipping_options,
@@ -552,12 +742,31 @@ class AliExpressConnector(BaseConnector):
             }
             
         except Exception as e:
-            logger.error(f"Erro ao calcular frete: {e}")
+            logger.error("Erro ao calcular frete: %s", e)
             return {'error': str(e)}
 
+    def _get_stock(self, product_id: str) -> int:
+        """
+        Obtém o estoque atual de um produto.
+        
+        Args:
+            product_id: ID do produto no AliExpress
+            
+        Returns:
+            int: Quantidade em estoque (0 se não encontrado ou em caso de erro)
+        """
+        try:
+            product = self.get_product_details(product_id)
+            return product.stock_quantity if product else 0
+                
+        except Exception as e:
+            logger.error("Erro ao sincronizar estoque do produto %s: %s", product_id, e)
+            return 0
+
     def sync_inventory(self, product_ids: List[str]) -> Dict[str, int]:
         """
         Sincroniza estoque de produtos específicos.
+        Os IDs são processados em lotes de BATCH_SIZE (ver _sync_inventory_chunk).
         
         Args:
             product_ids: Lista de IDs de produtos para sincronizar
@@ -566,58 +775,91 @@ class AliExpressConnector(BaseConnector):
             Dict: Mapeamento product_id -> quantidade em estoque
         """
         inventory = {}
+        batch_size = self.BATCH_SIZE
+        for start in range(0, len(product_ids), batch_size):
+            inventory.update(self._sync_inventory_chunk(product_ids[start:start + batch_size]))
+        return inventory
+
+    def _sync_inventory_chunk(self, chunk: List[str]) -> Dict[str, int]:
+        """
+        Sincroniza o estoque de um lote de produtos (chamado por sync_inventory).
+        A API não tem consulta de estoque em lote, então os produtos do lote
+        são consultados em paralelo.
         
-        for product_id in product_ids:
+        Args:
+            chunk: Lote de IDs de produtos
+            
+        Returns:
+            Dict: Mapeamento product_id -> quantidade em estoque
+        """
+        if not chunk:
+            return {}
+
+        max_workers = min(self.REQUEST_MAX_WORKERS, len(chunk))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(chunk, executor.map(self._get_stock, chunk)))
+
+    def _parse_product_batch(self, results: List[Dict[str, Any]]) -> List[Product]:
+        """
+        Converte um lote de produtos da API do AliExpress para nosso formato padrão.
+        O timestamp de atualização é gerado uma única vez para o lote.
+        
+        Args:
+            results: Lista de dados de produtos da API
+            
+        Returns:
+            List[Product]: Produtos padronizados (produtos com dados inválidos são ignorados)
+        """
+        last_updated = datetime.now().isoformat()
+        products = []
+        for product_data in results:
             try:
-                product = self.get_product_details(product_id)
-                if product:
-                    inventory[product_id] = product.stock_quantity
-                else:
-                    inventory[product_id] = 0
-                    
+                products.append(self._parse_product_data(product_data, last_updated=last_updated))
             except Exception as e:
-                logger.error(f"Erro ao sincronizar estoque do produto {product_id}: {e}")
-                inventory[product_id] = 0
-        
-        return inventory
+                logger.error("Erro ao converter produto: %s", e)
+        return products
 
-    def _parse_product_data(self, product_data: Dict[str, Any]) -> Product:
+    def _parse_product_data(self, product_data: Dict[str, Any], *, last_updated: Optional[str] = None) -> Product:
         """
         Converte dados do produto da API do AliExpress para nosso formato padrão.
         
         Args:
             product_data: Dados do produto da API
+            last_updated: Timestamp ISO já gerado (usado na conversão em lote)
             
         Returns:
             Product: Objeto produto padronizado
         """
+        # Cada bloco da resposta é lido uma única vez; só os campos usados são acessados
+        base_info = product_data.get('ae_item_base_info_dto') or {}
+        
         # Extrai imagens
-        images = []
-        if product_data.get('ae_item_base_info_dto', {}).get('image_urls'):
-            images = product_data['ae_item_base_info_dto']['image_urls'].split(';')
-        
-        # Extrai variações
-        variations = []
-        if product_data.get('ae_item_sku_info_dtos'):
-            for sku in product_data['ae_item_sku_info_dtos']:
-                variations.append({
-                    'sku_id': sku.get('id'),
-                    'sku_attr': sku.get('sku_attr'),
-                    'price': sku.get('sku_price'),
-                    'stock': sku.get('sku_stock'),
-                    'attributes': sku.get('sku_attr_name')
-                })
+        image_urls = base_info.get('image_urls')
+        images = image_urls.split(';') if image_urls else []
+        
+        # Extrai variações. Ficam como um dict por SKU: as rotas serializam
+        # product.variations direto em JSON e nenhum consumidor varre preço/estoque
+        # por SKU, então um layout colunar não teria quem o usasse
+        variations = [
+            {
+                'sku_id': sku.get('id'),
+                'sku_attr': sku.get('sku_attr'),
+                'price': sku.get('sku_price'),
+                'stock': sku.get('sku_stock'),
+                'attributes': sku.get('sku_attr_name')
+            }
+            for sku in product_data.get('ae_item_sku_info_dtos') or ()
+        ]
         
         # Informações de envio
         shipping_info = {}
-        if product_data.get('logistics_info_dto'):
+        logistics_info = product_data.get('logistics_info_dto')
+        if logistics_info:
             shipping_info = {
-                'delivery_time': product_data['logistics_info_dto'].get('delivery_time'),
-                'shipping_fee': product_data['logistics_info_dto'].get('shipping_fee')
+                'delivery_time': logistics_info.get('delivery_time'),
+                'shipping_fee': logistics_info.get('shipping_fee')
             }
         
-        base_info = product_data.get('ae_item_base_info_dto', {})
-        
         return Product(
             id=str(base_info.get('product_id', '')),
             name=base_info.get('subject', ''),
@@ -631,6 +873,6 @@ class AliExpressConnector(BaseConnector):
             supplier_id='aliexpress',
             supplier_product_id=str(base_info.get('product_id', '')),
             shipping_info=shipping_info,
-            last_updated=datetime.now().isoformat()
+            last_updated=last_updated or datetime.now().isoformat()
         )
 
@@ -3,21 +3,74 @@ Conector específico para CJ Dropshipping API.
 Implementa todas as funcionalidades necessárias para integração com o CJ Dropshipping.
 """
 
-import hashlib
-import hmac
+import copy
+import functools
+import threading
 import time
-import json
-import base64
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from src.models.connector_base import (
     BaseConnector, ConnectorConfig, Product, Order, OrderResponse, 
-    TrackingInfo, Address, OrderItem, OrderStatus
+    TrackingInfo, Address, OrderItem, OrderStatus, json_body, json_loads
 )
 import logging
+import requests
+
+try:
+    # pybase64 usa implementações SIMD (AVX2/NEON) com detecção de CPU em tempo de execução
+    from pybase64 import b64encode
+except ImportError:  # pybase64 é opcional; sem ele usamos o base64 da biblioteca padrão
+    from base64 import b64encode
 
 logger = logging.getLogger(__name__)
 
+# Parâmetros fixos da chamada de teste do token
+_TEST_TOKEN_PARAMS = {'pageNum': 1, 'pageSize': 1}
+
+# Códigos de erro da API que indicam token inválido, expirado ou revogado
+_AUTH_ERROR_CODES = frozenset({1600001, 1600002, 1600003})
+
+# Esquema das variações: (campo no nosso formato, chave na resposta da API)
+_VARIANT_SCHEMA = (
+    ('variant_id', 'vid'),
+    ('sku', 'variantSku'),
+    ('price', 'variantSellPrice'),
+    ('stock', 'variantQuantity'),
+    ('attributes', 'variantKey'),
+)
+
+# Mapeamento dos status de pedido do CJ Dropshipping para nosso enum
+_ORDER_STATUS_MAP = MappingProxyType({
+    'PENDING': OrderStatus.PENDING,
+    'PROCESSING': OrderStatus.PROCESSING,
+    'SHIPPED': OrderStatus.SHIPPED,
+    'DELIVERED': OrderStatus.DELIVERED,
+    'CANCELLED': OrderStatus.CANCELLED,
+    'FAILED': OrderStatus.FAILED
+})
+
+# Mapeamento dos status de rastreamento do CJ Dropshipping para nosso enum
+_TRACKING_STATUS_MAP = MappingProxyType({
+    'PENDING': OrderStatus.PENDING,
+    'PROCESSING': OrderStatus.PROCESSING,
+    'SHIPPED': OrderStatus.SHIPPED,
+    'DELIVERED': OrderStatus.DELIVERED,
+    'EXCEPTION': OrderStatus.FAILED
+})
+
+
+def _canonical_query(sorted_params: Tuple[Tuple[str, str], ...]) -> bytes:
+    """
+    Monta a consulta canônica ("k=v&k=v\n", sem URL-encoding) usada na assinatura, já em bytes.
+    Não há cache no nível do módulo: os parâmetros incluem palavras-chave de busca e IDs
+    de pedido, que não devem ficar em memória indefinidamente.
+    """
+    if not sorted_params:
+        return b'\n'
+    return ('&'.join([f"{k}={v}" for k, v in sorted_params]) + '\n').encode('utf-8')
+
 
 class CJDropshippingConnector(BaseConnector):
     """
@@ -25,10 +78,35 @@ class CJDropshippingConnector(BaseConnector):
     Implementa autenticação, busca de produtos, criação de pedidos e rastreamento.
     """
 
+    # Limite de consultas simultâneas na sincronização de estoque
+    SYNC_MAX_WORKERS = 16
+
+    # Validade (segundos) e tamanho máximo do cache de produtos
+    PRODUCT_CACHE_TTL = 60
+    PRODUCT_CACHE_MAXSIZE = 1024
+
+    # Validade dos tokens do CJ (~15 dias) e idade a partir da qual são renovados
+    TOKEN_VALIDITY = 14 * 24 * 3600
+    TOKEN_REFRESH_AFTER = 13 * 24 * 3600
+
+    # Intervalo (segundos) entre chamadas de teste de um token em cache; um token
+    # revogado é detectado no próximo teste ou na primeira resposta de erro de autenticação
+    TOKEN_CHECK_INTERVAL = 3600
+
+    # Tokens compartilhados entre instâncias:
+    # access_key -> (access_token, time.time() da obtenção, time.time() do último teste)
+    _TOKEN_CACHE: Dict[str, Tuple[str, float, float]] = {}
+    _TOKEN_LOCK = threading.Lock()
+
+    # Prefixos "método\ncaminho\n" já codificados, preenchidos sob demanda por endpoint
+    _SIGN_PREFIXES: Dict[Tuple[str, str], bytes] = {}
+
     def __init__(self, config: ConnectorConfig):
         super().__init__(config)
         self.access_key = config.api_key
         self.secret_key = config.api_secret
+        self._secret_bytes = (self.secret_key or '').encode('utf-8')
+        self._ipad_ctx, self._opad_ctx = self._build_hmac_states(self._secret_bytes)
         self.access_token = config.additional_config.get('access_token')
         
         # URLs da API do CJ Dropshipping
@@ -39,6 +117,12 @@ class CJDropshippingConnector(BaseConnector):
         self.default_currency = config.additional_config.get('default_currency', 'USD')
         self.warehouse_id = config.additional_config.get('warehouse_id', 'CN')
 
+        # Cache de assinaturas por (método, caminho, parâmetros ordenados, timestamp)
+        self._cached_signature = functools.lru_cache(maxsize=256)(self._sign_canonical)
+
+        # Cache de produtos: product_id -> (time.monotonic da consulta, Product)
+        self._product_cache: Dict[str, Tuple[float, Product]] = {}
+
     def _generate_signature(self, method: str, path: str, params: Dict[str, Any], timestamp: str) -> str:
         """
         Gera a assinatura necessária para autenticar requisições na API do CJ Dropshipping.
@@ -52,24 +136,52 @@ class CJDropshippingConnector(BaseConnector):
         Returns:
             str: Assinatura HMAC-SHA256
         """
-        # Ordena os parâmetros alfabeticamente
-        sorted_params = sorted(params.items()) if params else []
+        # Ordena os parâmetros alfabeticamente (sem parâmetros não há o que ordenar).
+        # Os valores entram como texto, exatamente como aparecem na consulta assinada: assim
+        # 10 e 10.0 (ou 1 e True) são chaves diferentes no cache de assinaturas
+        if not params:
+            sorted_params = ()
+        else:
+            sorted_params = tuple(sorted([(k, str(v)) for k, v in params.items()]))
         
-        # Constrói a string de consulta
-        query_string = '&'.join([f"{k}={v}" for k, v in sorted_params])
+        # O CJ-Timestamp tem resolução de segundos: dentro do mesmo segundo, requisições
+        # idênticas têm a mesma assinatura, que é reaproveitada do cache
+        return self._cached_signature(method, path, sorted_params, timestamp)
+
+    def _sign_canonical(self, method: str, path: str, sorted_params: Tuple[Tuple[str, str], ...], timestamp: str) -> str:
+        """
+        Calcula a assinatura a partir dos parâmetros já ordenados.
         
-        # Constrói a string para assinar
-        string_to_sign = f"{method}\n{path}\n{query_string}\n{timestamp}"
+        Args:
+            method: Método HTTP (GET, POST, etc.)
+            path: Caminho da API
+            sorted_params: Pares (chave, valor em texto) ordenados por chave
+            timestamp: Timestamp da requisição
+            
+        Returns:
+            str: Assinatura HMAC-SHA256 codificada em base64
+        """
+        # O prefixo "método\ncaminho\n" é fixo por endpoint e vem do cache
+        prefix = self._SIGN_PREFIXES.get((method, path))
+        if prefix is None:
+            prefix = f"{method}\n{path}\n".encode('utf-8')
+            self._SIGN_PREFIXES[(method, path)] = prefix
         
-        # Gera a assinatura HMAC-SHA256
-        signature = hmac.new(
-            self.secret_key.encode('utf-8'),
-            string_to_sign.encode('utf-8'),
-            hashlib.sha256
-        ).digest()
+        # Gera a assinatura HMAC-SHA256 a partir dos estados pré-calculados da chave.
+        # Copiar os estados do hashlib (OpenSSL) evita o wrapper Python do módulo hmac e
+        # sai mais barato que hmac.digest ou o HMAC do cryptography, que refazem a chave
+        inner = self._ipad_ctx.copy()
+        # A mensagem é montada direto em bytes: o prefixo já vem codificado do cache,
+        # a consulta é codificada uma vez e o timestamp (apenas dígitos) é codificado como ASCII
+        inner.update(prefix)
+        inner.update(_canonical_query(sorted_params))
+        inner.update(timestamp.encode('ascii'))
+        outer = self._opad_ctx.copy()
+        outer.update(inner.digest())
+        signature = outer.digest()
         
         # Codifica em base64
-        return base64.b64encode(signature).decode('utf-8')
+        return b64encode(signature).decode('utf-8')
 
     def _build_headers(self, method: str, path: str, params: Dict[str, Any] = None) -> Dict[str, str]:
         """
@@ -105,17 +217,59 @@ class CJDropshippingConnector(BaseConnector):
             bool: True se autenticado com sucesso
         """
         try:
+            cached = self._TOKEN_CACHE.get(self.access_key)
+            if cached is not None:
+                token, acquired_at, checked_at = cached
+                now = time.time()
+                age = now - acquired_at
+                if age < self.TOKEN_VALIDITY:
+                    # Token obtido neste processo e ainda válido: só é testado periodicamente
+                    self.access_token = token
+                    if now - checked_at >= self.TOKEN_CHECK_INTERVAL:
+                        if not self._test_token():
+                            current = self._TOKEN_CACHE.get(self.access_key)
+                            if current is None or current[0] != token:
+                                # Token rejeitado pela API (e já descartado): obtém outro
+                                return self._renew_shared_token(token)
+                            return False
+                        with self._TOKEN_LOCK:
+                            current = self._TOKEN_CACHE.get(self.access_key)
+                            if current is not None and current[0] == token:
+                                self._TOKEN_CACHE[self.access_key] = (token, acquired_at, now)
+                    if age >= self.TOKEN_REFRESH_AFTER:
+                        # Renova antes de expirar; se falhar, o token atual continua valendo
+                        self._renew_shared_token(token)
+                    return True
+            
             if self.access_token:
                 # Testa o token atual
                 return self._test_token()
             
             # Obtém novo token
-            return self._get_access_token()
+            return self._renew_shared_token(None)
             
         except Exception as e:
-            logger.error(f"Erro na autenticação CJ Dropshipping: {e}")
+            logger.error("Erro na autenticação CJ Dropshipping: %s", e)
             return False
 
+    def _renew_shared_token(self, stale_token: Optional[str]) -> bool:
+        """
+        Obtém um novo token, serializando as renovações entre instâncias com a mesma
+        access key: quem encontra o token já renovado por outra thread apenas o adota.
+        
+        Args:
+            stale_token: Token em cache que motivou a renovação (None se não havia)
+            
+        Returns:
+            bool: True se há um token válido
+        """
+        with self._TOKEN_LOCK:
+            cached = self._TOKEN_CACHE.get(self.access_key)
+            if cached is not None and cached[0] != stale_token:
+                self.access_token = cached[0]
+                return True
+            return self._get_access_token()
+
     def _get_access_token(self) -> bool:
         """
         Obtém um access token usando as credenciais.
@@ -137,21 +291,66 @@ class CJDropshippingConnector(BaseConnector):
                 'Content-Type': 'application/json'
             }
             
-            response = self._make_request('POST', url, json=params, headers=headers)
-            result = response.json()
+            response = self._make_request('POST', url, data=json_body(params), headers=headers)
+            result = json_loads(response.content)
             
             if result.get('result') and result.get('data'):
                 self.access_token = result['data'].get('accessToken')
+                if self.access_token:
+                    now = time.time()
+                    self._TOKEN_CACHE[self.access_key] = (self.access_token, now, now)
                 logger.info("CJ Dropshipping: Token obtido com sucesso")
                 return True
             else:
-                logger.error(f"CJ Dropshipping: Erro ao obter token: {result}")
+                logger.error("CJ Dropshipping: Erro ao obter token: %s", result)
                 return False
                 
         except Exception as e:
-            logger.error(f"CJ Dropshipping: Erro ao obter token: {e}")
+            logger.error("CJ Dropshipping: Erro ao obter token: %s", e)
             return False
 
+    def _invalidate_token(self, token: Optional[str]):
+        """
+        Descarta um token rejeitado pela API, do cache compartilhado e da instância.
+        
+        Args:
+            token: Token rejeitado
+        """
+        with self._TOKEN_LOCK:
+            cached = self._TOKEN_CACHE.get(self.access_key)
+            if cached is not None and cached[0] == token:
+                del self._TOKEN_CACHE[self.access_key]
+        if self.access_token == token:
+            self.access_token = None
+        logger.warning("CJ Dropshipping: Token rejeitado pela API; será obtido um novo")
+
+    def _request_json(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
+        """
+        Faz uma requisição autenticada e decodifica a resposta JSON.
+        Respostas de erro de autenticação (HTTP 401 ou códigos de token inválido)
+        descartam o token em uso, para que a próxima autenticação obtenha outro.
+        
+        Args:
+            method: Método HTTP (GET, POST, etc.)
+            url: URL da requisição
+            **kwargs: Parâmetros adicionais para requests
+            
+        Returns:
+            Dict: Resposta decodificada da API
+        """
+        token = self.access_token
+        try:
+            response = self._make_request(method, url, **kwargs)
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 401:
+                self._invalidate_token(token)
+            raise
+        
+        result = json_loads(response.content)
+        if not result.get('result') and result.get('code') in _AUTH_ERROR_CODES:
+            self._invalidate_token(token)
+        return result
+
     def _test_token(self) -> bool:
         """
         Testa se o token atual é válido fazendo uma chamada de teste.
@@ -163,19 +362,15 @@ class CJDropshippingConnector(BaseConnector):
             path = "/product/list"
             url = f"{self.api_base_url}{path}"
             
-            params = {
-                'pageNum': 1,
-                'pageSize': 1
-            }
+            params = _TEST_TOKEN_PARAMS
             
             headers = self._build_headers('GET', path, params)
-            response = self._make_request('GET', url, params=params, headers=headers)
-            result = response.json()
+            result = self._request_json('GET', url, params=params, headers=headers)
             
             return result.get('result', False)
             
         except Exception as e:
-            logger.error(f"CJ Dropshipping: Erro ao testar token: {e}")
+            logger.error("CJ Dropshipping: Erro ao testar token: %s", e)
             return False
 
     def get_product_details(self, product_id: str, **kwargs) -> Optional[Product]:
@@ -189,29 +384,63 @@ class CJDropshippingConnector(BaseConnector):
         Returns:
             Product: Objeto produto ou None se não encontrado
         """
+        # Produtos em cache são compartilhados: o chamador sempre recebe uma cópia
+        cached = self._product_cache.get(product_id)
+        if cached is not None and time.monotonic() - cached[0] < self.PRODUCT_CACHE_TTL:
+            return copy.deepcopy(cached[1])
+        
         try:
-            path = "/product/query"
-            url = f"{self.api_base_url}{path}"
-            
-            params = {
-                'pid': product_id
-            }
-            
-            headers = self._build_headers('GET', path, params)
-            response = self._make_request('GET', url, params=params, headers=headers)
-            result = response.json()
+            result = self._query_product(product_id)
             
             if result.get('result') and result.get('data'):
                 product_data = result['data']
-                return self._parse_product_data(product_data)
+                product = self._parse_product_data(product_data)
+                
+                self._cache_product(product_id, copy.deepcopy(product))
+                return product
             else:
-                logger.error(f"CJ Dropshipping: Erro ao obter produto {product_id}: {result}")
+                logger.error("CJ Dropshipping: Erro ao obter produto %s: %s", product_id, result)
                 return None
                 
         except Exception as e:
-            logger.error(f"CJ Dropshipping: Erro ao obter detalhes do produto {product_id}: {e}")
+            logger.error("CJ Dropshipping: Erro ao obter detalhes do produto %s: %s", product_id, e)
             return None
 
+    def _cache_product(self, product_id: str, product: Product):
+        """
+        Armazena um produto no cache, descartando a entrada mais antiga ao atingir o tamanho máximo.
+        
+        Args:
+            product_id: ID do produto no CJ Dropshipping
+            product: Produto a armazenar (não é entregue a chamadores)
+        """
+        cache = self._product_cache
+        # O dict preserva a ordem de inserção: a primeira chave é a mais antiga
+        cache.pop(product_id, None)
+        if len(cache) >= self.PRODUCT_CACHE_MAXSIZE:
+            cache.pop(next(iter(cache), None), None)
+        cache[product_id] = (time.monotonic(), product)
+
+    def _query_product(self, product_id: str) -> Dict[str, Any]:
+        """
+        Consulta um produto no endpoint /product/query.
+        
+        Args:
+            product_id: ID do produto no CJ Dropshipping
+            
+        Returns:
+            Dict: Resposta decodificada da API
+        """
+        path = "/product/query"
+        url = f"{self.api_base_url}{path}"
+        
+        params = {
+            'pid': product_id
+        }
+        
+        headers = self._build_headers('GET', path, params)
+        return self._request_json('GET', url, params=params, headers=headers)
+
     def search_products(self, query: str, **kwargs) -> List[Product]:
         """
         Busca produtos no catálogo do CJ Dropshipping.
@@ -244,21 +473,19 @@ class CJDropshippingConnector(BaseConnector):
                 params['warehouseId'] = kwargs['warehouse_id']
             
             headers = self._build_headers('GET', path, params)
-            response = self._make_request('GET', url, params=params, headers=headers)
-            result = response.json()
+            result = self._request_json('GET', url, params=params, headers=headers)
             
             products = []
             if result.get('result') and result.get('data', {}).get('list'):
-                for product_data in result['data']['list']:
-                    product = self._parse_product_data(product_data)
-                    if product:
-                        products.append(product)
+                parse = self._parse_product_data
+                last_updated = datetime.now().isoformat()
+                products = [parse(product_data, last_updated=last_updated) for product_data in result['data']['list']]
             
-            logger.info(f"CJ Dropshipping: Encontrados {len(products)} produtos para '{query}'")
+            logger.info("CJ Dropshipping: Encontrados %s produtos para '%s'", len(products), query)
             return products
             
         except Exception as e:
-            logger.error(f"CJ Dropshipping: Erro ao buscar produtos: {e}")
+            logger.error("CJ Dropshipping: Erro ao buscar produtos: %s", e)
             return []
 
     def create_order(self, order: Order) -> OrderResponse:
@@ -275,30 +502,35 @@ class CJDropshippingConnector(BaseConnector):
             path = "/shopping/order/createOrder"
             url = f"{self.api_base_url}{path}"
             
+            # Separa nome e sobrenome com um único split
+            address = order.shipping_address
+            name_parts = (address.full_name or '').split()
+            
             # Constrói o endereço de entrega
             shipping_address = {
-                'firstName': order.shipping_address.full_name.split()[0] if order.shipping_address.full_name else '',
-                'lastName': ' '.join(order.shipping_address.full_name.split()[1:]) if len(order.shipping_address.full_name.split()) > 1 else '',
-                'address': order.shipping_address.address_line1,
-                'address2': order.shipping_address.address_line2 or '',
-                'city': order.shipping_address.city,
-                'state': order.shipping_address.state,
-                'zip': order.shipping_address.postal_code,
-                'country': order.shipping_address.country,
-                'phone': order.shipping_address.phone,
-                'email': order.shipping_address.email or ''
+                'firstName': name_parts[0] if name_parts else '',
+                'lastName': ' '.join(name_parts[1:]),
+                'address': address.address_line1,
+                'address2': address.address_line2 or '',
+                'city': address.city,
+                'state': address.state,
+                'zip': address.postal_code,
+                'country': address.country,
+                'phone': address.phone,
+                'email': address.email or ''
             }
             
-            # Constrói os itens do pedido
-            products = []
-            for item in order.items:
-                product_item = {
+            # Constrói os itens do pedido (o método de envio é o mesmo para todos)
+            shipping_method = order.shipping_method or 'CJ_PACKET'
+            products = [
+                {
                     'pid': item.supplier_product_id,
                     'vid': item.variation_id or '',
                     'quantity': item.quantity,
-                    'shippingMethod': order.shipping_method or 'CJ_PACKET'
+                    'shippingMethod': shipping_method
                 }
-                products.append(product_item)
+                for item in order.items
+            ]
             
             # Parâmetros da API
             order_data = {
@@ -309,8 +541,7 @@ class CJDropshippingConnector(BaseConnector):
             }
             
             headers = self._build_headers('POST', path)
-            response = self._make_request('POST', url, json=order_data, headers=headers)
-            result = response.json()
+            result = self._request_json('POST', url, data=json_body(order_data), headers=headers)
             
             if result.get('result') and result.get('data'):
                 order_result = result['data']
@@ -336,7 +567,7 @@ class CJDropshippingConnector(BaseConnector):
                 )
                 
         except Exception as e:
-            logger.error(f"CJ Dropshipping: Erro ao criar pedido: {e}")
+            logger.error("CJ Dropshipping: Erro ao criar pedido: %s", e)
             return OrderResponse(
                 success=False,
                 order_id=None,
@@ -366,29 +597,19 @@ class CJDropshippingConnector(BaseConnector):
             }
             
             headers = self._build_headers('GET', path, params)
-            response = self._make_request('GET', url, params=params, headers=headers)
-            result = response.json()
+            result = self._request_json('GET', url, params=params, headers=headers)
             
             if result.get('result') and result.get('data'):
                 order_data = result['data']
                 
                 # Mapeia status do CJ Dropshipping para nosso enum
-                status_mapping = {
-                    'PENDING': OrderStatus.PENDING,
-                    'PROCESSING': OrderStatus.PROCESSING,
-                    'SHIPPED': OrderStatus.SHIPPED,
-                    'DELIVERED': OrderStatus.DELIVERED,
-                    'CANCELLED': OrderStatus.CANCELLED,
-                    'FAILED': OrderStatus.FAILED
-                }
-                
                 cj_status = order_data.get('orderStatus', 'PENDING')
-                return status_mapping.get(cj_status, OrderStatus.PENDING)
+                return _ORDER_STATUS_MAP.get(cj_status, OrderStatus.PENDING)
             
             return None
             
         except Exception as e:
-            logger.error(f"CJ Dropshipping: Erro ao obter status do pedido {order_id}: {e}")
+            logger.error("CJ Dropshipping: Erro ao obter status do pedido %s: %s", order_id, e)
             return None
 
     def get_tracking_info(self, tracking_number: str) -> Optional[TrackingInfo]:
@@ -410,32 +631,23 @@ class CJDropshippingConnector(BaseConnector):
             }
             
             headers = self._build_headers('GET', path, params)
-            response = self._make_request('GET', url, params=params, headers=headers)
-            result = response.json()
+            result = self._request_json('GET', url, params=params, headers=headers)
             
             if result.get('result') and result.get('data'):
                 tracking_data = result['data']
                 
                 # Mapeia status para nosso enum
-                status_mapping = {
-                    'PENDING': OrderStatus.PENDING,
-                    'PROCESSING': OrderStatus.PROCESSING,
-                    'SHIPPED': OrderStatus.SHIPPED,
-                    'DELIVERED': OrderStatus.DELIVERED,
-                    'EXCEPTION': OrderStatus.FAILED
-                }
-                
-                status = status_mapping.get(tracking_data.get('status', 'PENDING'), OrderStatus.PENDING)
+                status = _TRACKING_STATUS_MAP.get(tracking_data.get('status', 'PENDING'), OrderStatus.PENDING)
                 
                 # Constrói eventos de rastreamento
-                events = []
-                if tracking_data.get('trackingDetails'):
-                    for detail in tracking_data['trackingDetails']:
-                        events.append({
-                            'date': detail.get('time'),
-                            'description': detail.get('description'),
-                            'location': detail.get('location', '')
-                        })
+                events = [
+                    {
+                        'date': detail.get('time'),
+                        'description': detail.get('description'),
+                        'location': detail.get('location', '')
+                    }
+                    for detail in (tracking_data.get('trackingDetails') or ())
+                ]
                 
                 return TrackingInfo(
                     tracking_number=tracking_data.get('trackingNumber', tracking_number),
@@ -448,7 +660,7 @@ class CJDropshippingConnector(BaseConnector):
             return None
             
         except Exception as e:
-            logger.error(f"CJ Dropshipping: Erro ao obter rastreamento {tracking_number}: {e}")
+            logger.error("CJ Dropshipping: Erro ao obter rastreamento %s: %s", tracking_number, e)
             return None
 
     def calculate_shipping(self, items: List[OrderItem], address: Address) -> Dict[str, Any]:
@@ -481,8 +693,7 @@ class CJDropshippingConnector(BaseConnector):
             }
             
             headers = self._build_headers('POST', path)
-            response = self._make_request('POST', url, json=shipping_data, headers=headers)
-            result = response.json()
+            result = self._request_json('POST', url, data=json_body(shipping_data), headers=headers)
             
             shipping_options = []
             if result.get('result') and result.get('data'):
@@ -502,12 +713,38 @@ class CJDropshippingConnector(BaseConnector):
             }
             
         except Exception as e:
-            logger.error(f"CJ Dropshipping: Erro ao calcular frete: {e}")
+            logger.error("CJ Dropshipping: Erro ao calcular frete: %s", e)
             return {'error': str(e)}
 
+    def _get_stock_only(self, product_id: str) -> int:
+        """
+        Obtém o estoque atual de um produto lendo apenas o campo quantity,
+        sem montar o objeto Product completo. Sempre consulta a API: o cache
+        de produtos pode estar defasado e não serve para sincronizar estoque.
+        
+        Args:
+            product_id: ID do produto no CJ Dropshipping
+            
+        Returns:
+            int: Quantidade em estoque (0 se não encontrado ou em caso de erro)
+        """
+        try:
+            result = self._query_product(product_id)
+            
+            if result.get('result') and result.get('data'):
+                return int(result['data'].get('quantity', 0))
+            
+            logger.error("CJ Dropshipping: Erro ao obter produto %s: %s", product_id, result)
+            return 0
+                
+        except Exception as e:
+            logger.error("CJ Dropshipping: Erro ao sincronizar estoque do produto %s: %s", product_id, e)
+            return 0
+
     def sync_inventory(self, product_ids: List[str]) -> Dict[str, int]:
         """
         Sincroniza estoque de produtos específicos.
+        As consultas são feitas em paralelo, com concorrência limitada.
         
         Args:
             product_ids: Lista de IDs de produtos para sincronizar
@@ -515,75 +752,61 @@ class CJDropshippingConnector(BaseConnector):
         Returns:
             Dict: Mapeamento product_id -> quantidade em estoque
         """
-        inventory = {}
-        
-        for product_id in product_ids:
-            try:
-                product = self.get_product_details(product_id)
-                if product:
-                    inventory[product_id] = product.stock_quantity
-                else:
-                    inventory[product_id] = 0
-                    
-            except Exception as e:
-                logger.error(f"CJ Dropshipping: Erro ao sincronizar estoque do produto {product_id}: {e}")
-                inventory[product_id] = 0
-        
-        return inventory
+        if not product_ids:
+            return {}
+
+        max_workers = min(self.SYNC_MAX_WORKERS, len(product_ids))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(product_ids, executor.map(self._get_stock_only, product_ids)))
 
-    def _parse_product_data(self, product_data: Dict[str, Any]) -> Product:
+    def _parse_product_data(self, product_data: Dict[str, Any], *, last_updated: Optional[str] = None) -> Product:
         """
         Converte dados do produto da API do CJ Dropshipping para nosso formato padrão.
         
         Args:
             product_data: Dados do produto da API
+            last_updated: Timestamp ISO já gerado (compartilhado pelos produtos de uma página)
             
         Returns:
             Product: Objeto produto padronizado
         """
-        # Extrai imagens
-        images = []
-        if product_data.get('image'):
-            images.append(product_data['image'])
-        if product_data.get('images'):
-            images.extend(product_data['images'])
-        
-        # Extrai variações
-        variations = []
-        if product_data.get('variants'):
-            for variant in product_data['variants']:
-                variations.append({
-                    'variant_id': variant.get('vid'),
-                    'sku': variant.get('variantSku'),
-                    'price': variant.get('variantSellPrice'),
-                    'stock': variant.get('variantQuantity'),
-                    'attributes': variant.get('variantKey')
-                })
+        get = product_data.get
+        
+        # Extrai imagens (principal seguida das adicionais)
+        image = get('image')
+        images = [*((image,) if image else ()), *(get('images') or ())]
+        
+        # Extrai variações segundo o esquema fixo de campos
+        variations = [
+            {field: variant.get(key) for field, key in _VARIANT_SCHEMA}
+            for variant in (get('variants') or ())
+        ]
         
         # Informações de envio
         shipping_info = {
-            'warehouse': product_data.get('sourceFrom'),
-            'weight': product_data.get('packWeight'),
+            'warehouse': get('sourceFrom'),
+            'weight': get('packWeight'),
             'dimensions': {
-                'length': product_data.get('packLength'),
-                'width': product_data.get('packWidth'),
-                'height': product_data.get('packHeight')
+                'length': get('packLength'),
+                'width': get('packWidth'),
+                'height': get('packHeight')
             }
         }
         
+        pid = str(get('pid', ''))
         return Product(
-            id=str(product_data.get('pid', '')),
-            name=product_data.get('productName', ''),
-            description=product_data.get('description', ''),
-            price=float(product_data.get('sellPrice', 0)),
+            id=pid,
+            name=get('productName', ''),
+            description=get('description', ''),
+            price=float(get('sellPrice', 0)),
             currency='USD',
-            stock_quantity=int(product_data.get('quantity', 0)),
+            stock_quantity=int(get('quantity', 0)),
             images=images,
             variations=variations,
-            category=product_data.get('categoryName', ''),
+            category=get('categoryName', ''),
             supplier_id='cj_dropshipping',
-            supplier_product_id=str(product_data.get('pid', '')),
+            supplier_product_id=pid,
             shipping_info=shipping_info,
-            last_updated=datetime.now().isoformat()
+            last_updated=last_updated or datetime.now().isoformat()
         )
 
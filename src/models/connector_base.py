@@ -4,17 +4,61 @@ Define a interface comum que todos os conectores devem implementar.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import asdict, dataclass, is_dataclass
 from enum import Enum
+from urllib.parse import urlparse
+import hashlib
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import logging
 
+try:
+    import orjson
+except ImportError:  # orjson é opcional; sem ele usamos o json da biblioteca padrão
+    orjson = None
+
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Sessões HTTP compartilhadas pelas instâncias de conectores, por host da API
+_SESSIONS: Dict[str, requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def _json_default(value: Any) -> Any:
+    """Converte dataclasses e Enum para o json da biblioteca padrão (o orjson já os suporta)."""
+    if isinstance(value, Enum):
+        return value.value
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def json_loads(data: bytes) -> Any:
+    """Decodifica o corpo JSON de uma resposta, usando orjson quando disponível."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(value: Any) -> str:
+    """Serializa um valor em JSON (texto), usando orjson quando disponível."""
+    if orjson is not None:
+        return orjson.dumps(value).decode('utf-8')
+    return json.dumps(value, default=_json_default)
+
+
+def json_body(value: Any) -> bytes:
+    """Serializa o corpo JSON de uma requisição (bytes), usando orjson quando disponível."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, default=_json_default).encode('utf-8')
+
 
 class ConnectorStatus(Enum):
     """Status do conector"""
@@ -52,7 +96,7 @@ class ConnectorConfig:
             self.additional_config = {}
 
 
-@dataclass
+@dataclass(slots=True)
 class Product:
     """Estrutura de produto padronizada"""
     id: str
@@ -70,7 +114,7 @@ class Product:
     last_updated: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Address:
     """Estrutura de endereço padronizada"""
     full_name: str
@@ -84,7 +128,7 @@ class Address:
     email: Optional[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderItem:
     """Item do pedido"""
     product_id: str
@@ -95,7 +139,7 @@ class OrderItem:
     variation_attributes: Optional[Dict[str, str]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     """Estrutura de pedido padronizada"""
     id: str
@@ -107,7 +151,7 @@ class Order:
     notes: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OrderResponse:
     """Resposta da criação de pedido"""
     success: bool
@@ -119,7 +163,7 @@ class OrderResponse:
     error_code: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TrackingInfo:
     """Informações de rastreamento"""
     tracking_number: str
@@ -135,19 +179,92 @@ class BaseConnector(ABC):
     Define a interface comum que todos os conectores devem implementar.
     """
 
+    # Dimensionamento padrão do pool de conexões HTTP
+    # (ajustável por conector via additional_config: pool_connections, pool_maxsize)
+    POOL_CONNECTIONS = 32
+    POOL_MAXSIZE = 64
+
     def __init__(self, config: ConnectorConfig):
         self.config = config
-        self.session = requests.Session()
-        self.session.timeout = config.timeout
         self._setup_session()
 
+    # Decodificação JSON das respostas: os conectores devem usar
+    # self._json_loads(response.content) em vez de response.json()
+    _json_loads = staticmethod(json_loads)
+
     def _setup_session(self):
-        """Configuração inicial da sessão HTTP"""
-        self.session.headers.update({
+        """
+        Configuração inicial da sessão HTTP.
+        A sessão (e o seu pool de conexões) é compartilhada por todas as instâncias que
+        acessam o mesmo host; sem base_url, o compartilhamento é por classe de conector.
+        """
+        # Headers próprios deste conector, enviados em cada requisição (a sessão é compartilhada)
+        self._default_headers = {
             'User-Agent': f'HypeTotal-Connector/{self.config.name}',
             'Content-Type': 'application/json',
             'Accept': 'application/json'
-        })
+        }
+
+        session_key = urlparse(self.config.base_url or '').netloc or type(self).__name__
+        with _SESSIONS_LOCK:
+            session = _SESSIONS.get(session_key)
+            if session is None:
+                session = self._make_shared_session()
+                _SESSIONS[session_key] = session
+        self.session = session
+
+    def _make_shared_session(self) -> requests.Session:
+        """
+        Cria a sessão HTTP compartilhada, com pool keep-alive e retentativas.
+        As configurações de pool e retentativas vêm do primeiro conector a criá-la.
+        
+        Returns:
+            requests.Session: Sessão configurada
+        """
+        session = requests.Session()
+        session.headers['Connection'] = 'keep-alive'
+
+        # Retentativas feitas pelo urllib3, com backoff exponencial e apenas para falhas
+        # de conexão e erros 5xx; max_retries conta o total de tentativas
+        retry = Retry(
+            total=max(self.config.max_retries - 1, 0),
+            backoff_factor=0.3,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'POST', 'PUT', 'DELETE']),
+            raise_on_status=False
+        )
+
+        # Pool de conexões keep-alive: evita refazer TCP/TLS a cada requisição
+        additional_config = self.config.additional_config or {}
+        adapter = HTTPAdapter(
+            pool_connections=additional_config.get('pool_connections', self.POOL_CONNECTIONS),
+            pool_maxsize=additional_config.get('pool_maxsize', self.POOL_MAXSIZE),
+            pool_block=False,
+            max_retries=retry
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    @staticmethod
+    def _build_hmac_states(key: bytes) -> Tuple[Any, Any]:
+        """
+        Pré-calcula os estados SHA-256 interno (ipad) e externo (opad) do HMAC para uma chave fixa.
+        
+        Args:
+            key: Chave secreta em bytes
+            
+        Returns:
+            Tuple: Estados (interno, externo) prontos para serem copiados a cada assinatura
+        """
+        block_size = hashlib.sha256().block_size
+        if len(key) > block_size:
+            key = hashlib.sha256(key).digest()
+        key = key.ljust(block_size, b'\x00')
+
+        ipad_hash = hashlib.sha256(bytes(b ^ 0x36 for b in key))
+        opad_hash = hashlib.sha256(bytes(b ^ 0x5C for b in key))
+        return ipad_hash, opad_hash
 
     @abstractmethod
     def authenticate(self) -> bool:
@@ -268,7 +385,7 @@ class BaseConnector(ABC):
 
     def _make_request(self, method: str, url: str, **kwargs) -> requests.Response:
         """
-        Faz uma requisição HTTP com retry automático.
+        Faz uma requisição HTTP com retry automático (configurado no adapter da sessão).
         
         Args:
             method: Método HTTP (GET, POST, etc.)
@@ -278,17 +395,13 @@ class BaseConnector(ABC):
         Returns:
             requests.Response: Resposta da requisição
         """
-        for attempt in range(self.config.max_retries):
-            try:
-                response = self.session.request(method, url, **kwargs)
-                response.raise_for_status()
-                return response
-            except requests.exceptions.RequestException as e:
-                logger.warning(f"Tentativa {attempt + 1} falhou para {url}: {e}")
-                if attempt == self.config.max_retries - 1:
-                    raise
-        
-        raise Exception(f"Falha após {self.config.max_retries} tentativas")
+        headers = kwargs.get('headers')
+        kwargs['headers'] = {**self._default_headers, **headers} if headers else self._default_headers
+        kwargs.setdefault('timeout', self.config.timeout)
+
+        response = self.session.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response
 
     def get_connector_info(self) -> Dict[str, Any]:
         """
@@ -297,11 +410,13 @@ class BaseConnector(ABC):
         Returns:
             Dict: Informações do conector
         """
+        # Montado a cada chamada: a configuração pode ser alterada no lugar
+        config = self.config
         return {
-            'name': self.config.name,
-            'status': self.config.status.value,
-            'base_url': self.config.base_url,
-            'timeout': self.config.timeout,
-            'max_retries': self.config.max_retries
+            'name': config.name,
+            'status': config.status.value,
+            'base_url': config.base_url,
+            'timeout': config.timeout,
+            'max_retries': config.max_retries
         }
 
@@ -3,7 +3,11 @@ Gerenciador de conectores de dropshipping.
 Coordena múltiplos conectores e fornece uma interface unificada.
 """
 
-from typing import Dict, List, Optional, Any
+import copy
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple
 from src.models.connector_base import BaseConnector, Product, Order, OrderResponse, TrackingInfo, Address, OrderItem
 import logging
 
@@ -16,9 +20,59 @@ class ConnectorManager:
     Fornece uma interface unificada para interagir com múltiplos fornecedores.
     """
 
+    # Limite de chamadas simultâneas a fornecedores diferentes
+    FANOUT_MAX_WORKERS = 8
+
+    # Validade (segundos) e tamanho máximo dos caches de produtos e rastreamentos
+    PRODUCT_CACHE_TTL = 120
+    PRODUCT_CACHE_MAXSIZE = 4096
+    TRACKING_CACHE_TTL = 30
+    TRACKING_CACHE_MAXSIZE = 8192
+
     def __init__(self):
         self.connectors: Dict[str, BaseConnector] = {}
-        self.active_connectors: List[str] = []
+        # Dict usado como conjunto ordenado (valores None): mantém a ordem de registro
+        self.active_connectors: Dict[str, None] = {}
+
+        # Caches: chave -> (time.monotonic da consulta, resultado)
+        self._product_cache: Dict[Tuple, Tuple[float, Product]] = {}
+        self._tracking_cache: Dict[Tuple[str, str], Tuple[float, TrackingInfo]] = {}
+
+    @staticmethod
+    def _cache_get(cache: Dict[Tuple, Tuple[float, Any]], key: Tuple, ttl: float) -> Optional[Any]:
+        """
+        Obtém um valor do cache se ainda estiver dentro da validade.
+        
+        Args:
+            cache: Dicionário chave -> (timestamp, valor)
+            key: Chave procurada
+            ttl: Validade em segundos
+            
+        Returns:
+            Any: Valor em cache ou None se ausente/expirado
+        """
+        entry = cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        return None
+
+    @staticmethod
+    def _cache_put(cache: Dict[Tuple, Tuple[float, Any]], key: Tuple, value: Any, maxsize: int):
+        """
+        Armazena um valor no cache, descartando a entrada mais antiga ao atingir o tamanho máximo.
+        
+        Args:
+            cache: Dicionário chave -> (timestamp, valor)
+            key: Chave do valor
+            value: Valor a armazenar
+            maxsize: Número máximo de entradas
+        """
+        # O dict preserva a ordem de inserção: a primeira chave é a mais antiga.
+        # Com threads concorrentes a entrada pode já ter sido removida, daí os padrões
+        cache.pop(key, None)
+        if len(cache) >= maxsize:
+            cache.pop(next(iter(cache), None), None)
+        cache[key] = (time.monotonic(), value)
 
     def register_connector(self, name: str, connector: BaseConnector) -> bool:
         """
@@ -34,7 +88,7 @@ class ConnectorManager:
         try:
             if connector.test_connection():
                 self.connectors[name] = connector
-                self.active_connectors.append(name)
+                self.active_connectors[name] = None
                 logger.info(f"Conector {name} registrado com sucesso")
                 return True
             else:
@@ -56,8 +110,7 @@ class ConnectorManager:
         """
         if name in self.connectors:
             del self.connectors[name]
-            if name in self.active_connectors:
-                self.active_connectors.remove(name)
+            self.active_connectors.pop(name, None)
             logger.info(f"Conector {name} removido")
             return True
         return False
@@ -74,6 +127,19 @@ class ConnectorManager:
         """
         return self.connectors.get(name)
 
+    def _resolve_connectors(self, names: Iterable[str]) -> Dict[str, BaseConnector]:
+        """
+        Resolve vários nomes de conectores de uma vez, ignorando os não registrados.
+        
+        Args:
+            names: Nomes dos conectores
+            
+        Returns:
+            Dict: Mapeamento nome -> conector, na ordem recebida
+        """
+        registered = self.connectors
+        return {name: registered[name] for name in names if name in registered}
+
     def list_connectors(self) -> List[Dict[str, Any]]:
         """
         Lista todos os conectores registrados.
@@ -101,19 +167,67 @@ class ConnectorManager:
         Returns:
             Dict: Resultados por conector
         """
-        results = {}
-        for name in self.active_connectors:
-            try:
-                connector = self.connectors[name]
-                products = connector.search_products(query, **kwargs)
-                results[name] = products
-                logger.info(f"Encontrados {len(products)} produtos no {name}")
-            except Exception as e:
-                logger.error(f"Erro ao buscar produtos no {name}: {e}")
-                results[name] = []
+        # Fornecedores com erro ficam com lista vazia
+        results = {name: [] for name in self.active_connectors}
+        for name, products in self._iter_search_results(query, **kwargs):
+            results[name] = products
         
         return results
 
+    def search_products_iter(self, query: str, **kwargs) -> Iterator[Tuple[str, Product]]:
+        """
+        Busca produtos em todos os conectores ativos, entregando cada produto
+        assim que a busca do seu fornecedor termina.
+        
+        Args:
+            query: Termo de busca
+            **kwargs: Parâmetros adicionais
+            
+        Yields:
+            Tuple: (nome do conector, produto)
+        """
+        for name, products in self._iter_search_results(query, **kwargs):
+            for product in products:
+                yield name, product
+
+    def _iter_search_results(self, query: str, **kwargs) -> Iterator[Tuple[str, List[Product]]]:
+        """
+        Dispara as buscas de todos os conectores ativos em paralelo e entrega os
+        resultados na ordem em que as buscas terminam. Erros são registrados e o
+        fornecedor é omitido.
+        
+        Args:
+            query: Termo de busca
+            **kwargs: Parâmetros adicionais
+            
+        Yields:
+            Tuple: (nome do conector, lista de produtos)
+        """
+        names = list(self.active_connectors)
+        if not names:
+            return
+        
+        connectors = self.connectors
+        executor = ThreadPoolExecutor(max_workers=min(self.FANOUT_MAX_WORKERS, len(names)))
+        try:
+            futures = {
+                executor.submit(connectors[name].search_products, query, **kwargs): name
+                for name in names
+            }
+            
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    products = future.result()
+                except Exception as e:
+                    logger.error(f"Erro ao buscar produtos no {name}: {e}")
+                    continue
+                logger.info(f"Encontrados {len(products)} produtos no {name}")
+                yield name, products
+        finally:
+            # Se o consumidor parar antes do fim, as buscas restantes terminam em segundo plano
+            executor.shutdown(wait=False)
+
     def get_product_details_from_supplier(self, supplier_name: str, product_id: str, **kwargs) -> Optional[Product]:
         """
         Obtém detalhes de um produto de um fornecedor específico.
@@ -126,10 +240,27 @@ class ConnectorManager:
         Returns:
             Product: Detalhes do produto ou None
         """
+        # Produtos em cache são compartilhados: o chamador sempre recebe uma cópia
+        try:
+            cache_key = (supplier_name, product_id, tuple(sorted(kwargs.items())))
+            hash(cache_key)
+        except TypeError:
+            # Parâmetros não hasheáveis ou não ordenáveis: consulta sem cache
+            cache_key = None
+
+        if cache_key is not None:
+            cached = self._cache_get(self._product_cache, cache_key, self.PRODUCT_CACHE_TTL)
+            if cached is not None:
+                return copy.deepcopy(cached)
+
         connector = self.get_connector(supplier_name)
         if connector:
             try:
-                return connector.get_product_details(product_id, **kwargs)
+                product = connector.get_product_details(product_id, **kwargs)
+                if product is not None and cache_key is not None:
+                    self._cache_put(self._product_cache, cache_key, copy.deepcopy(product),
+                                    self.PRODUCT_CACHE_MAXSIZE)
+                return product
             except Exception as e:
                 logger.error(f"Erro ao obter produto {product_id} do {supplier_name}: {e}")
         return None
@@ -171,6 +302,22 @@ class ConnectorManager:
                 error_code="ORDER_CREATION_FAILED"
             )
 
+    @staticmethod
+    def _supplier_key(supplier_product_id: Any) -> str:
+        """
+        Extrai o fornecedor do prefixo de supplier_product_id ("<fornecedor>_<id>").
+        
+        Args:
+            supplier_product_id: ID do produto no fornecedor
+            
+        Returns:
+            str: Nome do fornecedor, ou 'unknown' sem prefixo ou com ID não textual
+        """
+        if not isinstance(supplier_product_id, str):
+            return 'unknown'
+        supplier, separator, _ = supplier_product_id.partition('_')
+        return supplier if separator else 'unknown'
+
     def calculate_shipping_options(self, items: List[OrderItem], address: Address) -> Dict[str, Dict[str, Any]]:
         """
         Calcula opções de envio em todos os conectores relevantes.
@@ -185,23 +332,27 @@ class ConnectorManager:
         shipping_options = {}
         
         # Agrupa itens por fornecedor
-        items_by_supplier = {}
+        items_by_supplier = defaultdict(list)
         for item in items:
-            supplier = item.supplier_product_id.split('_')[0] if '_' in item.supplier_product_id else 'unknown'
-            if supplier not in items_by_supplier:
-                items_by_supplier[supplier] = []
-            items_by_supplier[supplier].append(item)
-
-        # Calcula frete para cada fornecedor
-        for supplier, supplier_items in items_by_supplier.items():
-            connector = self.get_connector(supplier)
-            if connector:
-                try:
-                    options = connector.calculate_shipping(supplier_items, address)
-                    shipping_options[supplier] = options
-                except Exception as e:
-                    logger.error(f"Erro ao calcular frete no {supplier}: {e}")
-                    shipping_options[supplier] = {'error': str(e)}
+            items_by_supplier[self._supplier_key(item.supplier_product_id)].append(item)
+
+        # Calcula frete para cada fornecedor, em paralelo
+        connectors = self._resolve_connectors(items_by_supplier)
+        if not connectors:
+            return shipping_options
+
+        with ThreadPoolExecutor(max_workers=min(self.FANOUT_MAX_WORKERS, len(connectors))) as executor:
+            futures = {
+                supplier: executor.submit(connector.calculate_shipping, items_by_supplier[supplier], address)
+                for supplier, connector in connectors.items()
+            }
+
+        for supplier, future in futures.items():
+            try:
+                shipping_options[supplier] = future.result()
+            except Exception as e:
+                logger.error(f"Erro ao calcular frete no {supplier}: {e}")
+                shipping_options[supplier] = {'error': str(e)}
 
         return shipping_options
 
@@ -217,19 +368,39 @@ class ConnectorManager:
         """
         inventory_results = {}
         
-        for supplier, product_ids in product_mapping.items():
-            connector = self.get_connector(supplier)
-            if connector:
-                try:
-                    inventory = connector.sync_inventory(product_ids)
-                    inventory_results[supplier] = inventory
-                    logger.info(f"Sincronizado estoque de {len(product_ids)} produtos do {supplier}")
-                except Exception as e:
-                    logger.error(f"Erro ao sincronizar estoque do {supplier}: {e}")
-                    inventory_results[supplier] = {}
+        connectors = self._resolve_connectors(product_mapping)
+        if not connectors:
+            return inventory_results
+
+        # Cada fornecedor é sincronizado em paralelo com os demais
+        with ThreadPoolExecutor(max_workers=min(self.FANOUT_MAX_WORKERS, len(connectors))) as executor:
+            futures = {
+                supplier: executor.submit(connector.sync_inventory, product_mapping[supplier])
+                for supplier, connector in connectors.items()
+            }
+
+        for supplier, future in futures.items():
+            try:
+                inventory_results[supplier] = future.result()
+                self._invalidate_product_cache(supplier)
+                logger.info(f"Sincronizado estoque de {len(product_mapping[supplier])} produtos do {supplier}")
+            except Exception as e:
+                logger.error(f"Erro ao sincronizar estoque do {supplier}: {e}")
+                inventory_results[supplier] = {}
 
         return inventory_results
 
+    def _invalidate_product_cache(self, supplier_name: str):
+        """
+        Remove do cache os produtos de um fornecedor (ex.: após sincronizar o estoque).
+        
+        Args:
+            supplier_name: Nome do fornecedor/conector
+        """
+        for key in list(self._product_cache):
+            if key[0] == supplier_name:
+                self._product_cache.pop(key, None)
+
     def get_tracking_info_from_supplier(self, supplier_name: str, tracking_number: str) -> Optional[TrackingInfo]:
         """
         Obtém informações de rastreamento de um fornecedor específico.
@@ -241,10 +412,20 @@ class ConnectorManager:
         Returns:
             TrackingInfo: Informações de rastreamento ou None
         """
+        # TrackingInfo é imutável, mas a lista de eventos não: o chamador sempre recebe uma cópia
+        cache_key = (supplier_name, tracking_number)
+        cached = self._cache_get(self._tracking_cache, cache_key, self.TRACKING_CACHE_TTL)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
         connector = self.get_connector(supplier_name)
         if connector:
             try:
-                return connector.get_tracking_info(tracking_number)
+                tracking_info = connector.get_tracking_info(tracking_number)
+                if tracking_info is not None:
+                    self._cache_put(self._tracking_cache, cache_key, copy.deepcopy(tracking_info),
+                                    self.TRACKING_CACHE_MAXSIZE)
+                return tracking_info
             except Exception as e:
                 logger.error(f"Erro ao obter rastreamento {tracking_number} do {supplier_name}: {e}")
         return None
@@ -262,23 +443,99 @@ class ConnectorManager:
             'connectors': {}
         }
 
-        for name, connector in self.connectors.items():
-            try:
-                is_healthy = connector.test_connection()
-                health_status['connectors'][name] = {
-                    'status': 'healthy' if is_healthy else 'unhealthy',
-                    'active': name in self.active_connectors,
-                    'config': connector.get_connector_info()
-                }
-            except Exception as e:
-                health_status['connectors'][name] = {
-                    'status': 'error',
-                    'active': False,
-                    'error': str(e)
-                }
+        for name, (connector, is_healthy, error) in self._check_connections().items():
+            info = connector.get_connector_info() if error is None else None
+            health_status['connectors'][name] = self._health_entry(name, is_healthy, error, info)
 
         return health_status
 
+    def status_snapshot(self) -> Dict[str, Any]:
+        """
+        Retorna, em uma única passada, a listagem dos conectores (formato de
+        list_connectors) e o status de saúde (formato de health_check).
+        Cada conector é testado uma única vez e suas informações são montadas uma só vez.
+        
+        Returns:
+            Dict: 'connectors' (listagem) e 'health' (status de saúde)
+        """
+        listing = []
+        health_status = {
+            'total_connectors': len(self.connectors),
+            'active_connectors': len(self.active_connectors),
+            'connectors': {}
+        }
+
+        for name, (connector, is_healthy, error) in self._check_connections().items():
+            info = connector.get_connector_info()
+            listing.append({
+                'name': name,
+                'info': info,
+                'active': name in self.active_connectors
+            })
+            health_status['connectors'][name] = self._health_entry(
+                name, is_healthy, error, info if error is None else None
+            )
+
+        return {
+            'connectors': listing,
+            'health': health_status
+        }
+
+    def _health_entry(self, name: str, is_healthy: Optional[bool], error: Optional[str],
+                      info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Monta o status de saúde de um conector a partir do resultado do teste de conexão.
+        
+        Args:
+            name: Nome do conector
+            is_healthy: Resultado do teste (None em caso de erro)
+            error: Mensagem de erro do teste, se houver
+            info: Informações do conector (usadas quando não houve erro)
+            
+        Returns:
+            Dict: Status de saúde do conector
+        """
+        if error is not None:
+            return {
+                'status': 'error',
+                'active': False,
+                'error': error
+            }
+        return {
+            'status': 'healthy' if is_healthy else 'unhealthy',
+            'active': name in self.active_connectors,
+            'config': info
+        }
+
+    def _check_connections(self) -> Dict[str, Tuple[BaseConnector, Optional[bool], Optional[str]]]:
+        """
+        Testa a conexão de todos os conectores em paralelo. Um conector que não
+        responde dentro do próprio timeout é reportado sem bloquear os demais.
+        
+        Returns:
+            Dict: Mapeamento nome -> (conector, resultado do teste, mensagem de erro ou None)
+        """
+        results = {}
+        connectors = dict(self.connectors)
+        if not connectors:
+            return results
+
+        executor = ThreadPoolExecutor(max_workers=min(32, len(connectors)))
+        try:
+            futures = {name: executor.submit(connector.test_connection) for name, connector in connectors.items()}
+
+            for name, connector in connectors.items():
+                try:
+                    results[name] = (connector, futures[name].result(timeout=connector.config.timeout + 1), None)
+                except FutureTimeoutError:
+                    results[name] = (connector, None, f"Tempo esgotado após {connector.config.timeout + 1}s")
+                except Exception as e:
+                    results[name] = (connector, None, str(e))
+        finally:
+            executor.shutdown(wait=False)
+
+        return results
+
     def find_best_supplier_for_product(self, product_query: str, criteria: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
         """
         Encontra o melhor fornecedor para um produto baseado em critérios.
@@ -293,30 +550,68 @@ class ConnectorManager:
         if criteria is None:
             criteria = {'priority': 'price'}  # Padrão: menor preço
 
-        all_results = self.search_products_all(product_query)
-        best_option = None
-        best_score = float('inf') if criteria.get('priority') == 'price' else 0
+        by_price = criteria.get('priority') == 'price'
+        best = None
 
-        for supplier, products in all_results.items():
-            for product in products:
-                score = self._calculate_product_score(product, criteria)
-                
-                if criteria.get('priority') == 'price' and score < best_score:
-                    best_score = score
-                    best_option = {
-                        'supplier': supplier,
-                        'product': product,
-                        'score': score
-                    }
-                elif criteria.get('priority') != 'price' and score > best_score:
-                    best_score = score
-                    best_option = {
-                        'supplier': supplier,
-                        'product': product,
-                        'score': score
-                    }
-
-        return best_option
+        # Os resultados chegam na ordem em que as buscas terminam; em caso de empate
+        # vence o fornecedor registrado primeiro, independente do tempo de resposta
+        rank = {name: position for position, name in enumerate(self.active_connectors)}
+
+        # Pontua os resultados de cada fornecedor assim que chegam, mantendo só o melhor
+        # até o momento; preço: menor vence, demais critérios: maior vence
+        for supplier, products in self._iter_search_results(product_query):
+            if not products:
+                continue
+            scores = self._score_products(products, criteria)
+            score = min(scores) if by_price else max(scores)
+            if (best is None
+                    or (score < best[0] if by_price else score > best[0])
+                    or (score == best[0] and rank[supplier] < best[1])):
+                best = (score, rank[supplier], supplier, products[scores.index(score)])
+
+        if best is None:
+            return None
+        score, _, supplier, product = best
+        if not by_price and score <= 0:
+            return None
+
+        return {
+            'supplier': supplier,
+            'product': product,
+            'score': score
+        }
+
+    def _score_products(self, products: List[Product], criteria: Dict[str, Any]) -> List[float]:
+        """
+        Calcula a pontuação de vários produtos em uma única passada.
+        Os critérios são lidos uma só vez e a fórmula fica inline na compreensão,
+        sem chamada de função por produto.
+        
+        Args:
+            products: Produtos a serem avaliados
+            criteria: Critérios de avaliação
+            
+        Returns:
+            List[float]: Pontuações, na mesma ordem dos produtos
+        """
+        priority = criteria.get('priority')
+        if priority == 'price':
+            return [product.price for product in products]
+        if priority == 'stock':
+            return [product.stock_quantity for product in products]
+
+        # Pontuação composta (preço + estoque)
+        price_weight = criteria.get('price_weight', 0.7)
+        stock_weight = criteria.get('stock_weight', 0.3)
+
+        # Preço normalizado (menor é melhor) + estoque normalizado e limitado a 1.0 (maior é melhor),
+        # com os pesos já embutidos: price_weight / (preço + 1) e estoque * (stock_weight / 100)
+        stock_scale = stock_weight / 100
+        return [
+            price_weight / (product.price + 1)
+            + (product.stock_quantity * stock_scale if product.stock_quantity < 100 else stock_weight)
+            for product in products
+        ]
 
     def _calculate_product_score(self, product: Product, criteria: Dict[str, Any]) -> float:
         """
@@ -329,21 +624,7 @@ class ConnectorManager:
         Returns:
             float: Pontuação do produto
         """
-        if criteria.get('priority') == 'price':
-            return product.price
-        elif criteria.get('priority') == 'stock':
-            return product.stock_quantity
-        else:
-            # Pontuação composta (preço + estoque)
-            price_weight = criteria.get('price_weight', 0.7)
-            stock_weight = criteria.get('stock_weight', 0.3)
-            
-            # Normaliza preço (menor é melhor)
-            price_score = 1 / (product.price + 1)
-            # Normaliza estoque (maior é melhor)
-            stock_score = min(product.stock_quantity / 100, 1.0)
-            
-            return (price_score * price_weight) + (stock_score * stock_weight)
+        return self._score_products([product], criteria)[0]
 
 
 # Instância global do gerenciador
@@ -3,210 +3,476 @@ Conector de demonstração para AliExpress com dados simulados.
 Usado para testes e demonstrações quando não há credenciais reais disponíveis.
 """
 
+import functools
+import itertools
 import time
+import random
+import threading
 import json
-from typing import Dict, List, Optional, Any
+import uuid
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping, Optional, Any, Set, Tuple
 from datetime import datetime, timedelta
 from src.models.connector_base import (
     BaseConnector, ConnectorConfig, Product, Order, OrderResponse, 
     TrackingInfo, Address, OrderItem, OrderStatus
 )
+from src.models.demo_search import build_token_index, candidate_positions
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Fornecedor atribuído a todos os produtos simulados
+_SUPPLIER_ID = 'aliexpress_demo'
 
-class DemoAliExpressConnector(BaseConnector):
+# Eventos simulados de rastreamento: (deslocamento em dias, descrição, local)
+_TRACKING_TEMPLATE = (
+    (-5, 'Pedido confirmado pelo vendedor', 'Guangzhou, China'),
+    (-4, 'Produto embalado e pronto para envio', 'Guangzhou, China'),
+    (-3, 'Produto despachado para o país de destino', 'Guangzhou, China'),
+    (-1, 'Produto chegou ao país de destino', 'São Paulo, Brasil'),
+    (0, 'Produto em trânsito para entrega', 'São Paulo, Brasil'),
+)
+
+# Status simulados de pedido, escolhidos a partir do ID
+_ORDER_STATUSES = (
+    OrderStatus.CONFIRMED,
+    OrderStatus.PROCESSING,
+    OrderStatus.SHIPPED,
+    OrderStatus.DELIVERED
+)
+
+# Erros simulados na criação de pedido
+_CREATE_ORDER_ERRORS = (
+    "Produto fora de estoque",
+    "Endereço de entrega inválido",
+    "Método de pagamento rejeitado",
+    "Produto não disponível para este país"
+)
+
+# Respostas de erro simulado prontas; OrderResponse é imutável (frozen),
+# então a mesma instância pode ser devolvida a vários chamadores
+_FAILED_RESPONSES = tuple(
+    OrderResponse(
+        success=False,
+        order_id=None,
+        supplier_order_id=None,
+        tracking_number=None,
+        estimated_delivery=None,
+        message=f"Erro simulado: {error}",
+        error_code="DEMO_ERROR"
+    )
+    for error in _CREATE_ORDER_ERRORS
+)
+
+# Opções de frete simuladas (somente leitura)
+_SHIPPING_OPTIONS = (
+    {
+        'service_name': 'AliExpress Standard Shipping',
+        'cost': 0.00,
+        'currency': 'USD',
+        'delivery_time': '7-15 days',
+        'description': 'Frete grátis padrão'
+    },
+    {
+        'service_name': 'AliExpress Premium Shipping',
+        'cost': 9.99,
+        'currency': 'USD',
+        'delivery_time': '5-10 days',
+        'description': 'Entrega mais rápida com rastreamento'
+    },
+    {
+        'service_name': 'DHL Express',
+        'cost': 24.99,
+        'currency': 'USD',
+        'delivery_time': '3-7 days',
+        'description': 'Entrega expressa internacional'
+    },
+)
+
+
+def _shipping_options(standard_time: str, premium: Tuple[float, str],
+                      express: Tuple[float, str]) -> Tuple[Dict[str, Any], ...]:
     """
-    Conector de demonstração para AliExpress com dados simulados.
-    Simula todas as funcionalidades do conector real para fins de teste.
+    Monta a tabela de opções de frete de um destino.
+    
+    Args:
+        standard_time: Prazo do frete padrão (grátis)
+        premium: (custo, prazo) do frete premium
+        express: (custo, prazo) do DHL Express
+        
+    Returns:
+        Tuple: Opções de frete no formato de _SHIPPING_OPTIONS
     """
+    return (
+        {**_SHIPPING_OPTIONS[0], 'delivery_time': standard_time},
+        {**_SHIPPING_OPTIONS[1], 'cost': premium[0], 'delivery_time': premium[1]},
+        {**_SHIPPING_OPTIONS[2], 'cost': express[0], 'delivery_time': express[1]},
+    )
 
-    def __init__(self, config: ConnectorConfig):
-        super().__init__(config)
-        self.demo_mode = True
-        
-        # Produtos simulados para demonstração
-        self.demo_products = [
+
+# Tabelas de frete especializadas por país de destino; demais usam _SHIPPING_OPTIONS
+_SHIPPING_OPTIONS_BY_COUNTRY = MappingProxyType({
+    'BR': _shipping_options('15-30 days', (9.99, '10-20 days'), (29.99, '5-10 days')),
+    'US': _shipping_options('7-12 days', (7.99, '5-8 days'), (19.99, '3-5 days')),
+})
+
+
+# Produtos simulados para demonstração (compartilhados entre instâncias)
+_DEMO_PRODUCTS = (
+    {
+        'id': '1005004043442825',
+        'name': 'Smartphone Galaxy X1 Pro 128GB',
+        'description': 'Smartphone premium com tela AMOLED 6.7", câmera tripla 108MP, processador octa-core e bateria 5000mAh. Ideal para uso profissional e entretenimento.',
+        'price': 299.99,
+        'currency': 'USD',
+        'stock_quantity': 150,
+        'images': (
+            'https://ae01.alicdn.com/kf/S123456789.jpg',
+            'https://ae01.alicdn.com/kf/S987654321.jpg'
+        ),
+        'variations': (
             {
-                'id': '1005004043442825',
-                'name': 'Smartphone Galaxy X1 Pro 128GB',
-                'description': 'Smartphone premium com tela AMOLED 6.7", câmera tripla 108MP, processador octa-core e bateria 5000mAh. Ideal para uso profissional e entretenimento.',
+                'sku_id': 'SKU001',
+                'sku_attr': '14:350853#Black;5:361386#128GB',
                 'price': 299.99,
-                'currency': 'USD',
-                'stock_quantity': 150,
-                'images': [
-                    'https://ae01.alicdn.com/kf/S123456789.jpg',
-                    'https://ae01.alicdn.com/kf/S987654321.jpg'
-                ],
-                'variations': [
-                    {
-                        'sku_id': 'SKU001',
-                        'sku_attr': '14:350853#Black;5:361386#128GB',
-                        'price': 299.99,
-                        'stock': 50,
-                        'attributes': 'Color: Black, Storage: 128GB'
-                    },
-                    {
-                        'sku_id': 'SKU002',
-                        'sku_attr': '14:350854#Blue;5:361386#128GB',
-                        'price': 299.99,
-                        'stock': 45,
-                        'attributes': 'Color: Blue, Storage: 128GB'
-                    },
-                    {
-                        'sku_id': 'SKU003',
-                        'sku_attr': '14:350853#Black;5:361387#256GB',
-                        'price': 399.99,
-                        'stock': 30,
-                        'attributes': 'Color: Black, Storage: 256GB'
-                    }
-                ],
-                'category': 'Electronics',
-                'shipping_info': {
-                    'delivery_time': '7-15 days',
-                    'shipping_fee': 'Free'
-                }
+                'stock': 50,
+                'attributes': 'Color: Black, Storage: 128GB'
+            },
+            {
+                'sku_id': 'SKU002',
+                'sku_attr': '14:350854#Blue;5:361386#128GB',
+                'price': 299.99,
+                'stock': 45,
+                'attributes': 'Color: Blue, Storage: 128GB'
+            },
+            {
+                'sku_id': 'SKU003',
+                'sku_attr': '14:350853#Black;5:361387#256GB',
+                'price': 399.99,
+                'stock': 30,
+                'attributes': 'Color: Black, Storage: 256GB'
+            }
+        ),
+        'category': 'Electronics',
+        'shipping_info': {
+            'delivery_time': '7-15 days',
+            'shipping_fee': 'Free'
+        }
+    },
+    {
+        'id': '1005004043442826',
+        'name': 'Wireless Bluetooth Headphones Pro',
+        'description': 'Fones de ouvido sem fio com cancelamento de ruído ativo, bateria de 30h, som Hi-Fi e microfone integrado. Perfeito para trabalho e lazer.',
+        'price': 89.99,
+        'currency': 'USD',
+        'stock_quantity': 200,
+        'images': (
+            'https://ae01.alicdn.com/kf/H123456789.jpg',
+            'https://ae01.alicdn.com/kf/H987654321.jpg'
+        ),
+        'variations': (
+            {
+                'sku_id': 'SKU004',
+                'sku_attr': '14:350853#Black',
+                'price': 89.99,
+                'stock': 80,
+                'attributes': 'Color: Black'
             },
             {
-                'id': '1005004043442826',
-                'name': 'Wireless Bluetooth Headphones Pro',
-                'description': 'Fones de ouvido sem fio com cancelamento de ruído ativo, bateria de 30h, som Hi-Fi e microfone integrado. Perfeito para trabalho e lazer.',
+                'sku_id': 'SKU005',
+                'sku_attr': '14:350854#White',
                 'price': 89.99,
-                'currency': 'USD',
-                'stock_quantity': 200,
-                'images': [
-                    'https://ae01.alicdn.com/kf/H123456789.jpg',
-                    'https://ae01.alicdn.com/kf/H987654321.jpg'
-                ],
-                'variations': [
-                    {
-                        'sku_id': 'SKU004',
-                        'sku_attr': '14:350853#Black',
-                        'price': 89.99,
-                        'stock': 80,
-                        'attributes': 'Color: Black'
-                    },
-                    {
-                        'sku_id': 'SKU005',
-                        'sku_attr': '14:350854#White',
-                        'price': 89.99,
-                        'stock': 70,
-                        'attributes': 'Color: White'
-                    },
-                    {
-                        'sku_id': 'SKU006',
-                        'sku_attr': '14:350855#Red',
-                        'price': 94.99,
-                        'stock': 50,
-                        'attributes': 'Color: Red'
-                    }
-                ],
-                'category': 'Electronics',
-                'shipping_info': {
-                    'delivery_time': '5-12 days',
-                    'shipping_fee': 'Free'
-                }
+                'stock': 70,
+                'attributes': 'Color: White'
             },
             {
-                'id': '1005004043442827',
-                'name': 'Smart Watch Fitness Tracker',
-                'description': 'Relógio inteligente com monitor cardíaco, GPS, resistente à água IP68, tela touch colorida e bateria de 7 dias.',
+                'sku_id': 'SKU006',
+                'sku_attr': '14:350855#Red',
+                'price': 94.99,
+                'stock': 50,
+                'attributes': 'Color: Red'
+            }
+        ),
+        'category': 'Electronics',
+        'shipping_info': {
+            'delivery_time': '5-12 days',
+            'shipping_fee': 'Free'
+        }
+    },
+    {
+        'id': '1005004043442827',
+        'name': 'Smart Watch Fitness Tracker',
+        'description': 'Relógio inteligente com monitor cardíaco, GPS, resistente à água IP68, tela touch colorida e bateria de 7 dias.',
+        'price': 59.99,
+        'currency': 'USD',
+        'stock_quantity': 300,
+        'images': (
+            'https://ae01.alicdn.com/kf/W123456789.jpg',
+            'https://ae01.alicdn.com/kf/W987654321.jpg'
+        ),
+        'variations': (
+            {
+                'sku_id': 'SKU007',
+                'sku_attr': '14:350853#Black;200007763:201336100#42mm',
                 'price': 59.99,
-                'currency': 'USD',
-                'stock_quantity': 300,
-                'images': [
-                    'https://ae01.alicdn.com/kf/W123456789.jpg',
-                    'https://ae01.alicdn.com/kf/W987654321.jpg'
-                ],
-                'variations': [
-                    {
-                        'sku_id': 'SKU007',
-                        'sku_attr': '14:350853#Black;200007763:201336100#42mm',
-                        'price': 59.99,
-                        'stock': 100,
-                        'attributes': 'Color: Black, Size: 42mm'
-                    },
-                    {
-                        'sku_id': 'SKU008',
-                        'sku_attr': '14:350854#Silver;200007763:201336101#46mm',
-                        'price': 64.99,
-                        'stock': 80,
-                        'attributes': 'Color: Silver, Size: 46mm'
-                    }
-                ],
-                'category': 'Electronics',
-                'shipping_info': {
-                    'delivery_time': '6-14 days',
-                    'shipping_fee': 'Free'
-                }
+                'stock': 100,
+                'attributes': 'Color: Black, Size: 42mm'
             },
             {
-                'id': '1005004043442828',
-                'name': 'USB-C Fast Charging Cable 3m',
-                'description': 'Cabo USB-C de alta qualidade com carregamento rápido 100W, transferência de dados 480Mbps, resistente e durável.',
+                'sku_id': 'SKU008',
+                'sku_attr': '14:350854#Silver;200007763:201336101#46mm',
+                'price': 64.99,
+                'stock': 80,
+                'attributes': 'Color: Silver, Size: 46mm'
+            }
+        ),
+        'category': 'Electronics',
+        'shipping_info': {
+            'delivery_time': '6-14 days',
+            'shipping_fee': 'Free'
+        }
+    },
+    {
+        'id': '1005004043442828',
+        'name': 'USB-C Fast Charging Cable 3m',
+        'description': 'Cabo USB-C de alta qualidade com carregamento rápido 100W, transferência de dados 480Mbps, resistente e durável.',
+        'price': 12.99,
+        'currency': 'USD',
+        'stock_quantity': 500,
+        'images': (
+            'https://ae01.alicdn.com/kf/C123456789.jpg',
+        ),
+        'variations': (
+            {
+                'sku_id': 'SKU009',
+                'sku_attr': '14:350853#Black;200000124:200003482#3m',
                 'price': 12.99,
-                'currency': 'USD',
-                'stock_quantity': 500,
-                'images': [
-                    'https://ae01.alicdn.com/kf/C123456789.jpg'
-                ],
-                'variations': [
-                    {
-                        'sku_id': 'SKU009',
-                        'sku_attr': '14:350853#Black;200000124:200003482#3m',
-                        'price': 12.99,
-                        'stock': 200,
-                        'attributes': 'Color: Black, Length: 3m'
-                    },
-                    {
-                        'sku_id': 'SKU010',
-                        'sku_attr': '14:350854#White;200000124:200003481#2m',
-                        'price': 9.99,
-                        'stock': 300,
-                        'attributes': 'Color: White, Length: 2m'
-                    }
-                ],
-                'category': 'Electronics',
-                'shipping_info': {
-                    'delivery_time': '4-10 days',
-                    'shipping_fee': 'Free'
-                }
+                'stock': 200,
+                'attributes': 'Color: Black, Length: 3m'
             },
             {
-                'id': '1005004043442829',
-                'name': 'Portable Power Bank 20000mAh',
-                'description': 'Power bank portátil com capacidade 20000mAh, carregamento rápido PD 22.5W, display LED e múltiplas portas USB.',
+                'sku_id': 'SKU010',
+                'sku_attr': '14:350854#White;200000124:200003481#2m',
+                'price': 9.99,
+                'stock': 300,
+                'attributes': 'Color: White, Length: 2m'
+            }
+        ),
+        'category': 'Electronics',
+        'shipping_info': {
+            'delivery_time': '4-10 days',
+            'shipping_fee': 'Free'
+        }
+    },
+    {
+        'id': '1005004043442829',
+        'name': 'Portable Power Bank 20000mAh',
+        'description': 'Power bank portátil com capacidade 20000mAh, carregamento rápido PD 22.5W, display LED e múltiplas portas USB.',
+        'price': 34.99,
+        'currency': 'USD',
+        'stock_quantity': 180,
+        'images': (
+            'https://ae01.alicdn.com/kf/P123456789.jpg',
+            'https://ae01.alicdn.com/kf/P987654321.jpg'
+        ),
+        'variations': (
+            {
+                'sku_id': 'SKU011',
+                'sku_attr': '14:350853#Black;200000124:200003483#20000mAh',
                 'price': 34.99,
-                'currency': 'USD',
-                'stock_quantity': 180,
-                'images': [
-                    'https://ae01.alicdn.com/kf/P123456789.jpg',
-                    'https://ae01.alicdn.com/kf/P987654321.jpg'
-                ],
-                'variations': [
-                    {
-                        'sku_id': 'SKU011',
-                        'sku_attr': '14:350853#Black;200000124:200003483#20000mAh',
-                        'price': 34.99,
-                        'stock': 90,
-                        'attributes': 'Color: Black, Capacity: 20000mAh'
-                    },
-                    {
-                        'sku_id': 'SKU012',
-                        'sku_attr': '14:350854#Blue;200000124:200003482#10000mAh',
-                        'price': 24.99,
-                        'stock': 90,
-                        'attributes': 'Color: Blue, Capacity: 10000mAh'
-                    }
-                ],
-                'category': 'Electronics',
-                'shipping_info': {
-                    'delivery_time': '5-13 days',
-                    'shipping_fee': 'Free'
-                }
+                'stock': 90,
+                'attributes': 'Color: Black, Capacity: 20000mAh'
+            },
+            {
+                'sku_id': 'SKU012',
+                'sku_attr': '14:350854#Blue;200000124:200003482#10000mAh',
+                'price': 24.99,
+                'stock': 90,
+                'attributes': 'Color: Blue, Capacity: 10000mAh'
             }
-        ]
+        ),
+        'category': 'Electronics',
+        'shipping_info': {
+            'delivery_time': '5-13 days',
+            'shipping_fee': 'Free'
+        }
+    },
+)
+
+
+def _fold_tail(value: str) -> int:
+    """
+    Mistura os últimos 8 bytes de uma string em um inteiro estável.
+    
+    Args:
+        value: String de entrada (ex.: ID do pedido)
+        
+    Returns:
+        int: Valor determinístico, independente de PYTHONHASHSEED
+    """
+    folded = int.from_bytes(value.encode()[-8:], 'little')
+    folded ^= folded >> 32
+    folded ^= folded >> 16
+    folded ^= folded >> 8
+    return folded
+
+
+# Gerador aleatório por thread, sem compartilhar estado entre requisições
+_thread_state = threading.local()
+
+
+def _rng() -> random.Random:
+    """
+    Obtém o gerador aleatório da thread atual.
+    
+    Returns:
+        random.Random: Instância exclusiva da thread
+    """
+    rng = getattr(_thread_state, 'rng', None)
+    if rng is None:
+        rng = _thread_state.rng = random.Random()
+    return rng
+
+
+def _internal_error_response(error: Exception) -> OrderResponse:
+    """
+    Resposta padrão para falhas inesperadas na criação de pedido.
+    
+    Args:
+        error: Exceção capturada
+        
+    Returns:
+        OrderResponse: Resposta de erro interno
+    """
+    return OrderResponse(
+        success=False,
+        order_id=None,
+        supplier_order_id=None,
+        tracking_number=None,
+        estimated_delivery=None,
+        message=f"Erro interno: {str(error)}",
+        error_code="INTERNAL_ERROR"
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _tracking_payload(bucket: int) -> Tuple[Tuple[Mapping[str, str], ...], str, str]:
+    """
+    Monta os eventos simulados de rastreamento, reaproveitados dentro do minuto.
+    
+    Os eventos não dependem do número de rastreamento, então a chave é só
+    o intervalo de tempo; um novo intervalo descarta o anterior. Como o
+    resultado é compartilhado, os eventos são somente leitura.
+    
+    Args:
+        bucket: Intervalo atual (time.time() // TRACKING_REFRESH_SECONDS)
+        
+    Returns:
+        Tuple: (eventos, previsão de entrega, última atualização)
+    """
+    now = datetime.now()
+    
+    # Simula eventos de rastreamento
+    events = tuple(
+        MappingProxyType({
+            'date': (now + timedelta(days=days)).isoformat(),
+            'description': description,
+            'location': location
+        })
+        for days, description, location in _TRACKING_TEMPLATE
+    )
+    
+    return events, (now + timedelta(days=3)).isoformat(), now.isoformat()
+
+
+@functools.cache
+def _catalog_indexes() -> Tuple[Dict[str, Dict[str, Any]], Dict[str, int],
+                                Tuple[Tuple[str, str], ...], Dict[str, Set[int]]]:
+    """
+    Monta os índices do catálogo simulado, compartilhados entre instâncias.
+    
+    Returns:
+        Tuple: (produtos por ID, estoque por ID, textos de busca, índice invertido)
+    """
+    # Listas internas do catálogo são tuplas (uma vírgula faltando vira str);
+    # ValueError em vez de assert, que é removido com python -O
+    for p in _DEMO_PRODUCTS:
+        if not (isinstance(p['images'], tuple) and isinstance(p['variations'], tuple)):
+            raise ValueError(f"images/variations do produto simulado {p['id']} devem ser tuplas")
+    
+    products_by_id = {p['id']: p for p in _DEMO_PRODUCTS}
+    stock_by_id = {p['id']: p['stock_quantity'] for p in _DEMO_PRODUCTS}
+    
+    # Texto de busca em minúsculas pré-calculado (nome, descrição e categoria);
+    # o separador impede que um termo case atravessando dois campos
+    search_index = tuple(
+        (p['id'], '\x00'.join((p['name'], p['description'], p['category'])).lower())
+        for p in _DEMO_PRODUCTS
+    )
+    
+    # Índice invertido token -> posições em search_index
+    token_index = build_token_index(haystack for _, haystack in search_index)
+    
+    return products_by_id, stock_by_id, search_index, token_index
+
+
+class DemoAliExpressConnector(BaseConnector):
+    """
+    Conector de demonstração para AliExpress com dados simulados.
+    Simula todas as funcionalidades do conector real para fins de teste.
+    """
+
+    # Intervalo em que os eventos simulados de rastreamento são reaproveitados
+    TRACKING_REFRESH_SECONDS = 60
+
+    def __init__(self, config: ConnectorConfig):
+        super().__init__(config)
+        self.demo_mode = True
+        
+        # Produtos simulados para demonstração
+        self.demo_products = _DEMO_PRODUCTS
+        
+        # Índices do catálogo, montados uma única vez por processo
+        (self._products_by_id, self._stock_by_id,
+         self._search_index, self._token_index) = _catalog_indexes()
+        
+        # IDs de pedido simulados: prefixo único por instância (timestamp + trecho
+        # aleatório) seguido de um contador sem limite, então nenhum ID se repete;
+        # next() em itertools.count é atômico, então é seguro entre threads
+        self._order_id_prefix = f"AE{int(time.time())}{uuid.uuid4().hex[:8].upper()}"
+        self._order_id_counter = itertools.count()
+
+    @staticmethod
+    def _build_product(demo_product: Dict[str, Any], last_updated: str) -> Product:
+        """
+        Constrói um Product a partir de um registro simulado.
+        
+        O catálogo é imutável (tuplas e registros compartilhados), então cada
+        chamada recebe um Product novo com listas e dicts próprios.
+        
+        Args:
+            demo_product: Registro do catálogo simulado
+            last_updated: Timestamp ISO de atualização
+            
+        Returns:
+            Product: Produto padronizado
+        """
+        return Product(
+            id=demo_product['id'],
+            name=demo_product['name'],
+            description=demo_product['description'],
+            price=demo_product['price'],
+            currency=demo_product['currency'],
+            stock_quantity=demo_product['stock_quantity'],
+            images=list(demo_product['images']),
+            variations=[dict(variation) for variation in demo_product['variations']],
+            category=demo_product['category'],
+            supplier_id=_SUPPLIER_ID,
+            supplier_product_id=demo_product['id'],
+            shipping_info=dict(demo_product['shipping_info']),
+            last_updated=last_updated
+        )
 
     def authenticate(self) -> bool:
         """
@@ -231,31 +497,45 @@ class DemoAliExpressConnector(BaseConnector):
         """
         try:
             # Busca produto nos dados simulados
-            for demo_product in self.demo_products:
-                if demo_product['id'] == product_id:
-                    return Product(
-                        id=demo_product['id'],
-                        name=demo_product['name'],
-                        description=demo_product['description'],
-                        price=demo_product['price'],
-                        currency=demo_product['currency'],
-                        stock_quantity=demo_product['stock_quantity'],
-                        images=demo_product['images'],
-                        variations=demo_product['variations'],
-                        category=demo_product['category'],
-                        supplier_id='aliexpress_demo',
-                        supplier_product_id=demo_product['id'],
-                        shipping_info=demo_product['shipping_info'],
-                        last_updated=datetime.now().isoformat()
-                    )
-            
-            logger.warning(f"Demo AliExpress: Produto {product_id} não encontrado")
-            return None
+            demo_product = self._products_by_id.get(product_id)
+            if demo_product is None:
+                logger.warning("Demo AliExpress: Produto %s não encontrado", product_id)
+                return None
+            return self._build_product(demo_product, datetime.now().isoformat())
             
         except Exception as e:
-            logger.error(f"Demo AliExpress: Erro ao obter produto {product_id}: {e}")
+            logger.error("Demo AliExpress: Erro ao obter produto %s: %s", product_id, e)
             return None
 
+    def iter_search_products(self, query: str, **kwargs) -> Iterator[Product]:
+        """
+        Itera sob demanda pelos produtos simulados que casam com a query.
+        
+        Args:
+            query: Termo de busca
+            **kwargs: Parâmetros adicionais
+            
+        Yields:
+            Product: Produtos na ordem do catálogo
+        """
+        query_lower = query.lower()
+        products_by_id = self._products_by_id
+        build_product = self._build_product
+        last_updated = datetime.now().isoformat()
+        search_index = self._search_index
+        
+        positions = candidate_positions(query_lower, self._token_index)
+        entries = (
+            search_index if positions is None
+            else [search_index[position] for position in positions]
+        )
+        
+        # Busca por nome, descrição ou categoria; a checagem de substring
+        # confirma os candidatos vindos do índice
+        for product_id, haystack in entries:
+            if query_lower in haystack:
+                yield build_product(products_by_id[product_id], last_updated)
+
     def search_products(self, query: str, **kwargs) -> List[Product]:
         """
         Busca produtos simulados baseado na query.
@@ -268,37 +548,13 @@ class DemoAliExpressConnector(BaseConnector):
             List[Product]: Lista de produtos simulados
         """
         try:
-            results = []
-            query_lower = query.lower()
+            results = list(self.iter_search_products(query, **kwargs))
             
-            for demo_product in self.demo_products:
-                # Busca por nome ou descrição
-                if (query_lower in demo_product['name'].lower() or 
-                    query_lower in demo_product['description'].lower() or
-                    query_lower in demo_product['category'].lower()):
-                    
-                    product = Product(
-                        id=demo_product['id'],
-                        name=demo_product['name'],
-                        description=demo_product['description'],
-                        price=demo_product['price'],
-                        currency=demo_product['currency'],
-                        stock_quantity=demo_product['stock_quantity'],
-                        images=demo_product['images'],
-                        variations=demo_product['variations'],
-                        category=demo_product['category'],
-                        supplier_id='aliexpress_demo',
-                        supplier_product_id=demo_product['id'],
-                        shipping_info=demo_product['shipping_info'],
-                        last_updated=datetime.now().isoformat()
-                    )
-                    results.append(product)
-            
-            logger.info(f"Demo AliExpress: Encontrados {len(results)} produtos para '{query}'")
+            logger.info("Demo AliExpress: Encontrados %s produtos para '%s'", len(results), query)
             return results
             
         except Exception as e:
-            logger.error(f"Demo AliExpress: Erro na busca de produtos: {e}")
+            logger.error("Demo AliExpress: Erro na busca de produtos '%s': %s", query, e)
             return []
 
     def create_order(self, order: Order) -> OrderResponse:
@@ -312,12 +568,11 @@ class DemoAliExpressConnector(BaseConnector):
             OrderResponse: Resposta simulada
         """
         try:
-            # Simula processamento do pedido
-            import random
+            rng = _rng()
             
             # Simula sucesso em 90% dos casos
-            if random.random() < 0.9:
-                supplier_order_id = f"AE{int(time.time())}{random.randint(1000, 9999)}"
+            if rng.random() < 0.9:
+                supplier_order_id = f"{self._order_id_prefix}{next(self._order_id_counter):04d}"
                 
                 return OrderResponse(
                     success=True,
@@ -329,34 +584,11 @@ class DemoAliExpressConnector(BaseConnector):
                 )
             else:
                 # Simula erro ocasional
-                error_messages = [
-                    "Produto fora de estoque",
-                    "Endereço de entrega inválido",
-                    "Método de pagamento rejeitado",
-                    "Produto não disponível para este país"
-                ]
-                
-                return OrderResponse(
-                    success=False,
-                    order_id=None,
-                    supplier_order_id=None,
-                    tracking_number=None,
-                    estimated_delivery=None,
-                    message=f"Erro simulado: {random.choice(error_messages)}",
-                    error_code="DEMO_ERROR"
-                )
+                return rng.choice(_FAILED_RESPONSES)
                 
         except Exception as e:
-            logger.error(f"Demo AliExpress: Erro ao criar pedido: {e}")
-            return OrderResponse(
-                success=False,
-                order_id=None,
-                supplier_order_id=None,
-                tracking_number=None,
-                estimated_delivery=None,
-                message=f"Erro interno: {str(e)}",
-                error_code="INTERNAL_ERROR"
-            )
+            logger.error("Demo AliExpress: Erro ao criar pedido %s: %s", getattr(order, 'id', None), e)
+            return _internal_error_response(e)
 
     def get_order_status(self, order_id: str) -> Optional[OrderStatus]:
         """
@@ -368,19 +600,10 @@ class DemoAliExpressConnector(BaseConnector):
         Returns:
             OrderStatus: Status simulado
         """
-        import random
-        
-        # Simula diferentes status baseado no ID
-        statuses = [
-            OrderStatus.CONFIRMED,
-            OrderStatus.PROCESSING,
-            OrderStatus.SHIPPED,
-            OrderStatus.DELIVERED
-        ]
-        
-        # Usa hash do order_id para consistência
-        status_index = hash(order_id) % len(statuses)
-        return statuses[status_index]
+        # Usa os últimos bytes do order_id para consistência entre processos
+        # (hash() de str varia com PYTHONHASHSEED); 4 status -> máscara & 3.
+        # str() aceita IDs None ou numéricos, como o hash() fazia
+        return _ORDER_STATUSES[_fold_tail(str(order_id)) & 3]
 
     def get_tracking_info(self, tracking_number: str) -> Optional[TrackingInfo]:
         """
@@ -393,45 +616,21 @@ class DemoAliExpressConnector(BaseConnector):
             TrackingInfo: Informações simuladas
         """
         try:
-            # Simula eventos de rastreamento
-            events = [
-                {
-                    'date': (datetime.now() - timedelta(days=5)).isoformat(),
-                    'description': 'Pedido confirmado pelo vendedor',
-                    'location': 'Guangzhou, China'
-                },
-                {
-                    'date': (datetime.now() - timedelta(days=4)).isoformat(),
-                    'description': 'Produto embalado e pronto para envio',
-                    'location': 'Guangzhou, China'
-                },
-                {
-                    'date': (datetime.now() - timedelta(days=3)).isoformat(),
-                    'description': 'Produto despachado para o país de destino',
-                    'location': 'Guangzhou, China'
-                },
-                {
-                    'date': (datetime.now() - timedelta(days=1)).isoformat(),
-                    'description': 'Produto chegou ao país de destino',
-                    'location': 'São Paulo, Brasil'
-                },
-                {
-                    'date': datetime.now().isoformat(),
-                    'description': 'Produto em trânsito para entrega',
-                    'location': 'São Paulo, Brasil'
-                }
-            ]
+            events, estimated_delivery, last_updated = _tracking_payload(
+                int(time.time() // self.TRACKING_REFRESH_SECONDS)
+            )
             
+            # Cada chamador recebe cópias dos eventos compartilhados pelo cache
             return TrackingInfo(
                 tracking_number=tracking_number,
                 status=OrderStatus.SHIPPED,
-                events=events,
-                estimated_delivery=(datetime.now() + timedelta(days=3)).isoformat(),
-                last_updated=datetime.now().isoformat()
+                events=[dict(event) for event in events],
+                estimated_delivery=estimated_delivery,
+                last_updated=last_updated
             )
             
         except Exception as e:
-            logger.error(f"Demo AliExpress: Erro ao obter rastreamento: {e}")
+            logger.error("Demo AliExpress: Erro ao obter rastreamento %s: %s", tracking_number, e)
             return None
 
     def calculate_shipping(self, items: List[OrderItem], address: Address) -> Dict[str, Any]:
@@ -446,40 +645,19 @@ class DemoAliExpressConnector(BaseConnector):
             Dict: Opções de frete simuladas
         """
         try:
-            # Simula diferentes opções de frete
-            shipping_options = [
-                {
-                    'service_name': 'AliExpress Standard Shipping',
-                    'cost': 0.00,
-                    'currency': 'USD',
-                    'delivery_time': '7-15 days',
-                    'description': 'Frete grátis padrão'
-                },
-                {
-                    'service_name': 'AliExpress Premium Shipping',
-                    'cost': 9.99,
-                    'currency': 'USD',
-                    'delivery_time': '5-10 days',
-                    'description': 'Entrega mais rápida com rastreamento'
-                },
-                {
-                    'service_name': 'DHL Express',
-                    'cost': 24.99,
-                    'currency': 'USD',
-                    'delivery_time': '3-7 days',
-                    'description': 'Entrega expressa internacional'
-                }
-            ]
+            # Tabela especializada pelo país de destino; as opções são copiadas
+            # para que o chamador não altere as tabelas do módulo
+            options = _SHIPPING_OPTIONS_BY_COUNTRY.get(address.country, _SHIPPING_OPTIONS)
             
             return {
-                'options': shipping_options,
+                'options': [dict(option) for option in options],
                 'currency': 'USD',
                 'calculated_at': datetime.now().isoformat(),
                 'destination': f"{address.city}, {address.country}"
             }
             
         except Exception as e:
-            logger.error(f"Demo AliExpress: Erro ao calcular frete: {e}")
+            logger.error("Demo AliExpress: Erro ao calcular frete para %s itens: %s", len(items), e)
             return {'error': str(e)}
 
     def sync_inventory(self, product_ids: List[str]) -> Dict[str, int]:
@@ -492,18 +670,11 @@ class DemoAliExpressConnector(BaseConnector):
         Returns:
             Dict: Estoque simulado por produto
         """
-        inventory = {}
+        stock = self._stock_by_id.get
         
-        for product_id in product_ids:
-            # Busca produto nos dados simulados
-            for demo_product in self.demo_products:
-                if demo_product['id'] == product_id:
-                    inventory[product_id] = demo_product['stock_quantity']
-                    break
-            else:
-                # Produto não encontrado
-                inventory[product_id] = 0
+        # Produtos não encontrados ficam com estoque 0
+        inventory = {product_id: stock(product_id, 0) for product_id in product_ids}
         
-        logger.info(f"Demo AliExpress: Sincronizado estoque de {len(product_ids)} produtos")
+        logger.info("Demo AliExpress: Sincronizado estoque de %s produtos", len(product_ids))
         return inventory
 
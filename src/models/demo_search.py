@@ -0,0 +1,62 @@
+"""
+Busca nos catálogos simulados dos conectores de demonstração.
+Índice invertido de tokens compartilhado pelos conectores demo.
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+# Token de busca: sequência alfanumérica (sem '_'), usada no índice invertido
+_TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+def build_token_index(texts: Iterable[str]) -> Dict[str, Set[int]]:
+    """
+    Monta o índice invertido token -> posições dos textos de busca.
+
+    Args:
+        texts: Textos de busca já em minúsculas, na ordem do catálogo
+
+    Returns:
+        Dict: Mapeamento token -> posições em que ele aparece
+    """
+    token_index = defaultdict(set)
+    for position, text in enumerate(texts):
+        for token in _TOKEN_RE.findall(text):
+            token_index[token].add(position)
+    return dict(token_index)
+
+
+def candidate_positions(query_lower: str, token_index: Dict[str, Set[int]]) -> Optional[List[int]]:
+    """
+    Restringe a busca usando o índice invertido.
+
+    Só os tokens delimitados dos dois lados dentro da query precisam
+    aparecer inteiros no texto do produto; o primeiro e o último podem
+    casar parcialmente (ex.: 'phone' em 'smartphone'), então não filtram.
+
+    Args:
+        query_lower: Query já em minúsculas
+        token_index: Índice invertido token -> posições
+
+    Returns:
+        List[int]: Posições candidatas em ordem, ou None se a query não
+        tem tokens delimitados e todo o catálogo precisa ser varrido
+    """
+    query_len = len(query_lower)
+    tokens = [
+        match.group() for match in _TOKEN_RE.finditer(query_lower)
+        if match.start() > 0 and match.end() < query_len
+    ]
+    if not tokens:
+        return None
+
+    postings = []
+    for token in tokens:
+        posting = token_index.get(token)
+        if not posting:
+            return []
+        postings.append(posting)
+
+    return sorted(set.intersection(*postings))
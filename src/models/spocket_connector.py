@@ -11,7 +11,7 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 from src.models.connector_base import (
     BaseConnector, ConnectorConfig, Product, Order, OrderResponse, 
-    TrackingInfo, Address, OrderItem, OrderStatus
+    TrackingInfo, Address, OrderItem, OrderStatus, json_body
 )
 import logging
 
@@ -36,20 +36,21 @@ class SpocketConnector(BaseConnector):
         self.default_country = config.additional_config.get('default_country', 'US')
         self.default_currency = config.additional_config.get('default_currency', 'USD')
 
-    def _build_headers(self) -> Dict[str, str]:
-        """
-        Constrói os headers necessários para requisições da API.
-        
-        Returns:
-            Dict: Headers da requisição
-        """
-        headers = {
+        # Headers de autenticação montados uma única vez (a API key não muda)
+        self._auth_headers = {
             'Content-Type': 'application/json',
             'Authorization': f'Bearer {self.api_key}',
             'Accept': 'application/json'
         }
+
+    def _build_headers(self) -> Dict[str, str]:
+        """
+        Retorna os headers necessários para requisições da API.
         
-        return headers
+        Returns:
+            Dict: Headers da requisição (pré-montados; não devem ser alterados)
+        """
+        return self._auth_headers
 
     def authenticate(self) -> bool:
         """
@@ -103,7 +104,7 @@ class SpocketConnector(BaseConnector):
             
             headers = self._build_headers()
             response = self._make_request('GET', url, headers=headers)
-            result = response.json()
+            result = self._json_loads(response.content)
             
             if 'product' in result:
                 product_data = result['product']
@@ -148,7 +149,7 @@ class SpocketConnector(BaseConnector):
             
             headers = self._build_headers()
             response = self._make_request('GET', url, params=params, headers=headers)
-            result = response.json()
+            result = self._json_loads(response.content)
             
             products = []
             if 'products' in result:
@@ -214,8 +215,8 @@ class SpocketConnector(BaseConnector):
             }
             
             headers = self._build_headers()
-            response = self._make_request('POST', url, json=order_data, headers=headers)
-            result = response.json()
+            response = self._make_request('POST', url, data=json_body(order_data), headers=headers)
+            result = self._json_loads(response.content)
             
             if 'order' in result and result.get('success', False):
                 order_result = result['order']
@@ -267,7 +268,7 @@ class SpocketConnector(BaseConnector):
             
             headers = self._build_headers()
             response = self._make_request('GET', url, headers=headers)
-            result = response.json()
+            result = self._json_loads(response.content)
             
             if 'order' in result:
                 order_data = result['order']
@@ -306,7 +307,7 @@ class SpocketConnector(BaseConnector):
             
             headers = self._build_headers()
             response = self._make_request('GET', url, headers=headers)
-            result = response.json()
+            result = self._json_loads(response.content)
             
             if 'tracking' in result:
                 tracking_data = result['tracking']
@@ -380,8 +381,8 @@ class SpocketConnector(BaseConnector):
             }
             
             headers = self._build_headers()
-            response = self._make_request('POST', url, json=shipping_data, headers=headers)
-            result = response.json()
+            response = self._make_request('POST', url, data=json_body(shipping_data), headers=headers)
+            result = self._json_loads(response.content)
             
             shipping_options = []
             if 'shipping_rates' in result:
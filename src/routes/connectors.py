@@ -46,6 +46,24 @@ def health_check():
         }), 500
 
 
+@connectors_bp.route('/connectors/status', methods=['GET'])
+def status_snapshot():
+    """Lista os conectores e verifica a saúde de todos em uma única chamada."""
+    try:
+        snapshot = connector_manager.status_snapshot()
+        return jsonify({
+            'success': True,
+            'connectors': snapshot['connectors'],
+            'health': snapshot['health']
+        })
+    except Exception as e:
+        logger.error(f"Erro ao obter status dos conectores: {e}")
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
+
+
 @connectors_bp.route('/connectors/<connector_name>/test', methods=['POST'])
 def test_connector(connector_name):
     """Testa a conexão de um conector específico."""